@@ -9,6 +9,15 @@ __version__ = "0.1.1"
 
 from sevenbridges.api import Api
 from sevenbridges.config import Config
+from sevenbridges.http.cache import ConditionalCache
+from sevenbridges.http.circuit import CircuitBreakers, RetryBudget
+from sevenbridges.http.concurrency import AdaptiveConcurrency
+from sevenbridges.http.hedging import Hedging
+from sevenbridges.http.idempotency import FileJournal, Idempotency
+from sevenbridges.http.ratelimit import (
+    Priority, RateLimiter, SharedRateLimiter
+)
+from sevenbridges.http.recorder import FlightRecorder
 
 from sevenbridges.models.billing_group import BillingGroup
 from sevenbridges.models.billing_group import BillingGroupBreakdown
@@ -19,3 +28,4 @@ from sevenbridges.models.task import Task
 from sevenbridges.models.app import App
 from sevenbridges.models.invoice import Invoice
 from sevenbridges.models.member import Member, Permissions
+from sevenbridges.models.rate_limit import RateLimit
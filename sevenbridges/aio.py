@@ -0,0 +1,50 @@
+"""
+Asyncio flavour of the sevenbridges-python bindings. Requires Python 3.6+
+and the httpx package.
+"""
+from sevenbridges.http.aio import AsyncHttpClient
+from sevenbridges.models.aio import (
+    AsyncApp, AsyncBillingGroup, AsyncEndpoints, AsyncFile, AsyncInvoice,
+    AsyncProject, AsyncRateLimit, AsyncTask, AsyncUser
+)
+
+
+class AsyncApi(AsyncHttpClient):
+    """AsyncApi aggregates all asyncio resource classes into single place"""
+
+    users = AsyncUser
+    endpoints = AsyncEndpoints
+    projects = AsyncProject
+    files = AsyncFile
+    apps = AsyncApp
+    billing_groups = AsyncBillingGroup
+    invoices = AsyncInvoice
+    tasks = AsyncTask
+    rate_limit = AsyncRateLimit
+
+    def __init__(self, url=None, token=None, oauth_token=None, config=None,
+                 timeout=None, retry=5, max_connections=100, session=None,
+                 codec=None, compress_threshold=None):
+        """
+        Initializes asyncio api object. Resources accessed through it expose
+        coroutines instead of blocking methods.
+
+        :param url: Api url.
+        :param token: Secure token.
+        :param oauth_token: Oauth token.
+        :param config: Configuration profile.
+        :param timeout: Client timeout.
+        :param retry: Number of retries.
+        :param max_connections: Max number of concurrent connections.
+        :param session: Optional httpx.AsyncClient instance.
+        :param codec: Json codec, fastest available one is used by default.
+        :param compress_threshold: Request bodies of at least this many
+            bytes are sent gzip compressed, disabled by default.
+        :return: AsyncApi object instance.
+        """
+        super(AsyncApi, self).__init__(
+            url=url, token=token, oauth_token=oauth_token, config=config,
+            timeout=timeout, retry=retry, max_connections=max_connections,
+            session=session, codec=codec,
+            compress_threshold=compress_threshold
+        )
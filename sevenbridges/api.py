@@ -1,10 +1,14 @@
 from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from sevenbridges.http.client import HttpClient
+from sevenbridges.http.concurrency import AdaptiveConcurrency
+from sevenbridges.http.transport import SessionPool
 from sevenbridges.models.app import App
 from sevenbridges.models.invoice import Invoice
 from sevenbridges.models.task import Task
 from sevenbridges.models.user import User
 from sevenbridges.models.project import Project
+from sevenbridges.models.rate_limit import RateLimit
 from sevenbridges.models.endpoints import Endpoints
 from sevenbridges.models.file import File
 from sevenbridges.models.billing_group import BillingGroup
@@ -21,10 +25,17 @@ class Api(HttpClient):
     billing_groups = BillingGroup
     invoices = Invoice
     tasks = Task
+    rate_limit = RateLimit
 
     def __init__(self, url=None, token=None, oauth_token=None, config=None,
                  timeout=None, retry=5, download_max_workers=32,
-                 upload_max_workers=16):
+                 upload_max_workers=16, rate_limiter=None,
+                 error_handlers=None, codec=None, metrics=True,
+                 conditional_cache=None, coalesce=False, transport=None,
+                 compress_threshold=None, request_deadline=None,
+                 hedging=None, circuit_breakers=None, retry_budget=None,
+                 idempotency=None, download_concurrency=None,
+                 bulk_concurrency=None, flight_recorder=True):
         """
         Initializes api object. If url and token are not supplied,
         the check for the .sbgrc configuration file will occur, checking if the
@@ -36,16 +47,84 @@ class Api(HttpClient):
         :param token: Secure token.
         :param oauth_token: Oauth token.
         :param config: Configuration profile.
-        :param timeout: Client timeout.
+        :param timeout: Client timeout, a single value or a tuple of
+            connect and read timeouts applied to every attempt.
         :param retry: Number of retries.
-        :param download_max_workers: Max number of threads for download.
-        :param upload_max_workers: Max number of threads for upload.
+        :param download_max_workers: Max number of threads for download,
+            also the size of the download connection pool per host.
+        :param upload_max_workers: Max number of threads for upload and
+            bulk operations.
+        :param rate_limiter: RateLimiter instance used to pace the requests.
+        :param error_handlers: List of error handlers, by default requests
+            rejected by the rate limit are resubmitted after the limit resets.
+        :param codec: Json codec, fastest available one is used by default.
+        :param metrics: If True request metrics are recorded.
+        :param conditional_cache: ConditionalCache instance, if set GET
+            requests are revalidated using ETag and Last-Modified headers.
+        :param coalesce: If True identical concurrent GET requests share
+            a single response.
+        :param transport: Transport used to send the api requests, by
+            default a requests session is used.
+        :param compress_threshold: Request bodies of at least this many
+            bytes are sent gzip compressed, disabled by default.
+        :param request_deadline: Time budget in seconds of every api call
+            including all retries.
+        :param hedging: Hedging policy, if set slow GET requests are sent
+            again and the first response is used.
+        :param circuit_breakers: CircuitBreakers instance, if set requests
+            to failing endpoint groups fail fast.
+        :param retry_budget: RetryBudget shared by api requests and
+            download retries.
+        :param idempotency: Idempotency instance, if set task creation,
+            copies and member additions are retried safely.
+        :param download_concurrency: AdaptiveConcurrency limiting the
+            number of chunks downloaded at once, by default it starts at
+            download_max_workers and adapts between 4 and
+            download_max_workers.
+        :param bulk_concurrency: AdaptiveConcurrency limiting the number of
+            concurrent requests of bulk operations, by default it adapts
+            between 1 and upload_max_workers.
+        :param flight_recorder: FlightRecorder instance keeping the most
+            recent requests, if True one with the default capacity is used.
         :return: Api object instance.
         """
         super(Api, self).__init__(url=url, token=token,
                                   oauth_token=oauth_token,
-                                  config=config, retry=retry, timeout=timeout)
+                                  config=config, retry=retry, timeout=timeout,
+                                  rate_limiter=rate_limiter,
+                                  error_handlers=error_handlers,
+                                  pool_maxsize=max(download_max_workers,
+                                                   upload_max_workers),
+                                  codec=codec, metrics=metrics,
+                                  conditional_cache=conditional_cache,
+                                  coalesce=coalesce, transport=transport,
+                                  compress_threshold=compress_threshold,
+                                  request_deadline=request_deadline,
+                                  hedging=hedging,
+                                  circuit_breakers=circuit_breakers,
+                                  retry_budget=retry_budget,
+                                  idempotency=idempotency,
+                                  flight_recorder=flight_recorder)
 
         self.download_pool = ThreadPoolExecutor(
             max_workers=download_max_workers)
         self.upload_pool = ThreadPoolExecutor(max_workers=upload_max_workers)
+        if download_concurrency is None:
+            download_concurrency = AdaptiveConcurrency(
+                initial=download_max_workers,
+                minimum=min(4, download_max_workers),
+                maximum=download_max_workers
+            )
+        if bulk_concurrency is None:
+            bulk_concurrency = AdaptiveConcurrency(
+                initial=4, maximum=upload_max_workers
+            )
+        self.download_concurrency = download_concurrency
+        self.bulk_concurrency = bulk_concurrency
+
+        # Keep-alive connections to the storage hosts shared by all downloads,
+        # each download thread gets its own session.
+        adapter = HTTPAdapter(pool_maxsize=download_max_workers)
+        self.download_session = SessionPool(
+            {'https://': adapter, 'http://': adapter}
+        )
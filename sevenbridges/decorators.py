@@ -31,6 +31,39 @@ def inplace_reload(method):
     return wrapped
 
 
+def check_response(response):
+    """
+    Inspects the response object for specific errors.
+    :param response: Response object.
+    :return: Response object or None if server returned no content.
+    """
+    status_code = response.status_code
+    if status_code in range(200, 204):
+        return response
+    if status_code == 204:
+        return
+    data = response.json()
+    e = {
+        400: BadRequest,
+        401: Unauthorized,
+        403: Forbidden,
+        404: NotFound,
+        405: MethodNotAllowed,
+        408: RequestTimeout,
+        409: Conflict,
+        429: TooManyRequests,
+    }.get(status_code, SbgError)()
+    if 'message' in data:
+        e.message = data['message']
+    if 'code' in data:
+        e.code = data['code']
+    if 'status' in data:
+        e.status = data['status']
+    if 'more_info' in data:
+        e.more_info = data['more_info']
+    raise e
+
+
 def check_for_error(func):
     """
     Executes the wrapped function and inspects the response object
@@ -41,31 +74,7 @@ def check_for_error(func):
     def wrapper(*args, **kwargs):
         try:
             response = func(*args, **kwargs)
-            status_code = response.status_code
-            if status_code in range(200, 204):
-                return response
-            if status_code == 204:
-                return
-            data = response.json()
-            e = {
-                400: BadRequest,
-                401: Unauthorized,
-                403: Forbidden,
-                404: NotFound,
-                405: MethodNotAllowed,
-                408: RequestTimeout,
-                409: Conflict,
-                429: TooManyRequests,
-            }.get(status_code, SbgError)()
-            if 'message' in data:
-                e.message = data['message']
-            if 'code' in data:
-                e.code = data['code']
-            if 'status' in data:
-                e.status = data['status']
-            if 'more_info' in data:
-                e.more_info = data['more_info']
-            raise e
+            return check_response(response)
         except requests.RequestException as e:
             raise SbgError(message=str(e))
         except ValueError as e:
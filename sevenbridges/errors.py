@@ -50,6 +50,20 @@ class PaginationError(SbgError):
         )
 
 
+class DeadlineExceeded(SbgError):
+    def __init__(self, message):
+        super(DeadlineExceeded, self).__init__(
+            code=-1, status=-1, message=message
+        )
+
+
+class CircuitOpen(SbgError):
+    def __init__(self, message):
+        super(CircuitOpen, self).__init__(
+            code=-1, status=-1, message=message
+        )
+
+
 class BadRequest(SbgError):
     def __init__(self, code=None, message=None, more_info=None):
         super(BadRequest, self).__init__(
@@ -0,0 +1,180 @@
+"""
+Asyncio implementation of the http client. Requires Python 3.5+ and the
+httpx package.
+"""
+import asyncio
+import random
+import timeit
+
+from sevenbridges.errors import SbgError
+from sevenbridges.decorators import check_response
+from sevenbridges.http.client import HttpClient
+from sevenbridges.http.error_handlers import RateLimitSleeper
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncHttpClient(HttpClient):
+    """
+    Asyncio counterpart of the HttpClient. All request methods are
+    coroutines and a single event loop can keep many requests in flight
+    over a shared pool of connections. Of the error handlers only the
+    RateLimitSleeper is applied, waiting with asyncio.sleep.
+    """
+
+    def __init__(self, url=None, token=None, oauth_token=None, config=None,
+                 timeout=None, retry=5, max_connections=100, session=None,
+                 codec=None, compress_threshold=None):
+        """
+        :param url: Api url.
+        :param token: Secure token.
+        :param oauth_token: Oauth token.
+        :param config: Configuration profile.
+        :param timeout: Client timeout.
+        :param retry: Number of retries.
+        :param max_connections: Max number of concurrent connections.
+        :param session: Optional httpx.AsyncClient instance.
+        :param codec: Json codec, fastest available one is used by default.
+        :param compress_threshold: Request bodies of at least this many
+            bytes are sent gzip compressed, disabled by default.
+        """
+        if httpx is None:
+            raise SbgError(
+                message='Asyncio support requires the httpx package.'
+            )
+        super(AsyncHttpClient, self).__init__(
+            url=url, token=token, oauth_token=oauth_token, config=config,
+            timeout=timeout, retry=retry, codec=codec,
+            compress_threshold=compress_threshold
+        )
+        self.retry = retry
+        self.max_connections = max_connections
+        self._async_session = session
+
+    def _default_transport(self, pool_maxsize, retry, retry_budget):
+        # Requests are sent by the httpx session.
+        return None
+
+    @property
+    def session(self):
+        if self._async_session is None:
+            self._async_session = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections),
+                transport=httpx.AsyncHTTPTransport(retries=self.retry)
+            )
+        return self._async_session
+
+    async def _send(self, verb, url, headers, params, content, stream):
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        if stream:
+            request = self.session.build_request(verb, url, params=params)
+            return await self.session.send(request, stream=True)
+
+        for _ in range(self.retry + 1):
+            response = await self.session.request(
+                verb, url, params=params, content=content, headers=headers
+            )
+            if response.status_code not in (500, 503):
+                break
+        return response
+
+    async def _resubmit_rate_limited(self, response, verb, url, headers,
+                                     params, content):
+        """
+        Asyncio counterpart of the RateLimitSleeper error handler.
+        """
+        for sleeper in self.error_handlers:
+            if not isinstance(sleeper, RateLimitSleeper):
+                continue
+            retries = 0
+            while sleeper._resubmittable(response, retries):
+                wait = sleeper.wait_time(response)
+                if wait is None or wait > sleeper.max_wait:
+                    break
+                await asyncio.sleep(wait + random.uniform(0, sleeper.jitter))
+                self._process_response(response)
+                response = await self._send(
+                    verb, url, headers, params, content, False
+                )
+                retries += 1
+        return response
+
+    async def _request(self, verb, url, headers=None, params=None, data=None,
+                       append_base=False, stream=False):
+        url, headers = self._prepare_request(url, headers, append_base)
+        started = timeit.default_timer()
+        response = content = error = None
+        try:
+            if data is not None and not stream:
+                content = self._encode(data, headers)
+            response = await self._send(
+                verb, url, headers, params, content, stream
+            )
+            if not stream:
+                response = await self._resubmit_rate_limited(
+                    response, verb, url, headers, params, content
+                )
+            return check_response(self._process_response(response))
+        except httpx.HTTPError as e:
+            error = e
+            raise SbgError(message=str(e))
+        except ValueError as e:
+            error = e
+            raise SbgError(message=str(e))
+        finally:
+            if self._metrics is not None or (
+                    self._flight_recorder is not None):
+                self._record(verb, url, started, response, content, stream,
+                             attempts=1, error=error)
+
+    async def get(self, url, headers=None, params=None, data=None,
+                  append_base=True, stream=False):
+        return await self._request(
+            'GET', url=url, headers=headers, params=params, data=data,
+            append_base=append_base, stream=stream
+        )
+
+    async def post(self, url, headers=None, params=None, data=None,
+                   append_base=True):
+        return await self._request(
+            'POST', url=url, headers=headers, params=params, data=data,
+            append_base=append_base
+        )
+
+    async def put(self, url, headers=None, params=None, data=None,
+                  append_base=True):
+        return await self._request(
+            'PUT', url=url, headers=headers, params=params, data=data,
+            append_base=append_base
+        )
+
+    async def patch(self, url, headers=None, params=None, data=None,
+                    append_base=True):
+        return await self._request(
+            'PATCH', url=url, headers=headers, params=params, data=data,
+            append_base=append_base
+        )
+
+    async def delete(self, url, headers=None, params=None, append_base=True):
+        return await self._request(
+            'DELETE', url=url, headers=headers, params=params, data={},
+            append_base=append_base
+        )
+
+    async def close(self):
+        """
+        Closes all connections held by the client.
+        """
+        if self._async_session is not None:
+            await self._async_session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheEntry(object):
+    """
+    Cached representation of a resource with its validators.
+    """
+
+    def __init__(self, etag, last_modified, headers, content, encoding):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+
+class ConditionalCache(object):
+    """
+    Bounded LRU cache of GET responses carrying an ETag or Last-Modified
+    validator. Cached validators are sent with subsequent requests for the
+    same url and the cached body is reused when the server responds with
+    304 Not Modified.
+    """
+
+    def __init__(self, max_entries=1000):
+        """
+        :param max_entries: Maximum number of cached responses.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, params=None):
+        """
+        Creates the cache key from the request url and query parameters.
+        """
+        if not params:
+            return url, ()
+        return url, tuple(sorted(
+            (k, str(v)) for k, v in params.items() if v is not None
+        ))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.pop(key)
+                self._entries[key] = entry
+            return entry
+
+    def conditional_headers(self, key):
+        """
+        Returns validator headers for the cached resource.
+        :param key: Cache key.
+        :return: Dictionary of headers, empty if resource is not cached.
+        """
+        entry = self.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key, response):
+        """
+        Stores the response if it carries a validator.
+        :param key: Cache key.
+        :param response: Response object.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            self.discard(key)
+            return
+        entry = CacheEntry(
+            etag=etag, last_modified=last_modified,
+            headers=dict(response.headers), content=response.content,
+            encoding=response.encoding
+        )
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def revalidated(self, key, response):
+        """
+        Builds the response from the cached entry after the server
+        confirmed that resource was not modified.
+        :param key: Cache key.
+        :param response: The 304 response.
+        :return: Response object or None if resource is not cached.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.reason = 'OK'
+        cached.url = response.url
+        cached.request = response.request
+        cached.encoding = entry.encoding
+        cached._content = entry.content
+        cached.headers = CaseInsensitiveDict(entry.headers)
+        # Rate limit and request id headers belong to the new response.
+        cached.headers.update(response.headers)
+        cached.headers['Content-Length'] = str(len(entry.content))
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
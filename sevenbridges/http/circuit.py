@@ -0,0 +1,213 @@
+import threading
+import time
+
+from requests.packages.urllib3.exceptions import MaxRetryError, ResponseError
+from requests.packages.urllib3.util import Retry
+
+from sevenbridges.errors import CircuitOpen
+
+
+class RetryBudget(object):
+    """
+    Retry budget shared by all threads using the same client. Every request
+    deposits a fraction of a token and every retry withdraws a whole one,
+    so retries are capped to a ratio of the regular traffic, with a small
+    reserve replenished over time that allows retries when traffic is low.
+    """
+
+    def __init__(self, ratio=0.1, min_per_second=1.0, max_tokens=100):
+        """
+        :param ratio: Number of retries allowed per request.
+        :param min_per_second: Retries allowed per second regardless of
+            the traffic.
+        :param max_tokens: Max number of retries that can be saved up.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = float(max_tokens)
+        self.exhausted = 0
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, tokens):
+        now = time.time()
+        tokens += (now - self._updated) * self.min_per_second
+        self._updated = now
+        self.tokens = min(self.tokens + tokens, self.max_tokens)
+
+    def deposit(self):
+        """
+        Records a request.
+        """
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self):
+        """
+        Reserves a retry.
+        :return: True if the retry fits into the budget.
+        """
+        with self._lock:
+            self._refill(0)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+    def __repr__(self):
+        return '<RetryBudget: tokens={:.1f}>'.format(self.tokens)
+
+
+class BudgetRetry(Retry):
+    """
+    Urllib3 retry configuration that stops retrying once the shared retry
+    budget is exhausted or the deadline of the calling thread has passed.
+    """
+
+    budget = None
+    # Callable returning the deadline in effect for the calling thread.
+    deadline = None
+
+    def new(self, **kwargs):
+        retry = super(BudgetRetry, self).new(**kwargs)
+        retry.budget = self.budget
+        retry.deadline = self.deadline
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        deadline = self.deadline() if self.deadline is not None else None
+        if deadline is not None and deadline.expired:
+            raise MaxRetryError(
+                _pool, url, error or ResponseError('deadline exceeded')
+            )
+        if self.budget is not None and not self.budget.withdraw():
+            raise MaxRetryError(
+                _pool, url, error or ResponseError('retry budget exhausted')
+            )
+        return super(BudgetRetry, self).increment(
+            method=method, url=url, response=response, error=error,
+            _pool=_pool, _stacktrace=_stacktrace
+        )
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker of a single endpoint group. After a number of
+    consecutive failures the circuit opens and requests fail fast. Once the
+    recovery timeout passes a single probe request is let through, closing
+    the circuit if it succeeds.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30):
+        """
+        :param name: Endpoint group name.
+        :param failure_threshold: Consecutive failures opening the circuit.
+        :param recovery_timeout: Seconds before a probe request is sent.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened = None
+        self._probing = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Checks whether the request may be sent.
+        :raises CircuitOpen: If the circuit is open.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.time()
+            if self.state == self.OPEN:
+                if now - self._opened < self.recovery_timeout:
+                    raise self._error()
+                self.state = self.HALF_OPEN
+            elif self._probing is not None and (
+                    now - self._probing < self.recovery_timeout):
+                raise self._error()
+            self._probing = now
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                    self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened = time.time()
+                self._probing = None
+
+    def record(self, status_code):
+        """
+        Records the outcome of the request, server errors are failures.
+        :param status_code: Response status code.
+        """
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _error(self):
+        return CircuitOpen(
+            message='Circuit for {} requests is open after {} consecutive '
+                    'failures.'.format(self.name, self.failures)
+        )
+
+    def __repr__(self):
+        return '<CircuitBreaker: {}, state={}>'.format(self.name, self.state)
+
+
+class CircuitBreakers(object):
+    """
+    Registry of circuit breakers, one per endpoint group.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30):
+        """
+        :param failure_threshold: Consecutive failures opening the circuit.
+        :param recovery_timeout: Seconds before a probe request is sent.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, group):
+        """
+        Returns the circuit breaker of the endpoint group.
+        :param group: Endpoint group name.
+        :return: CircuitBreaker object.
+        """
+        with self._lock:
+            breaker = self._breakers.get(group)
+            if breaker is None:
+                breaker = self._breakers[group] = CircuitBreaker(
+                    group, failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout
+                )
+            return breaker
+
+    def states(self):
+        """
+        :return: Dictionary of circuit states keyed by the endpoint group.
+        """
+        with self._lock:
+            return dict(
+                (group, breaker.state)
+                for group, breaker in self._breakers.items()
+            )
@@ -1,10 +1,23 @@
-import json
+import contextlib
+import functools
 import platform
+import threading
+import timeit
+
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util import Retry
-from sevenbridges.errors import SbgError
+from six.moves import urllib
+from sevenbridges.errors import SbgError, DeadlineExceeded
 from sevenbridges.decorators import check_for_error
+from sevenbridges.http.codec import default_codec, gzip_compress
+from sevenbridges.http.context import RequestContext
+from sevenbridges.http.deadline import Deadline
+from sevenbridges.http.error_handlers import RateLimitSleeper
+from sevenbridges.http.idempotency import Idempotency
+from sevenbridges.http.metrics import Metrics, resolve_template
+from sevenbridges.http.ratelimit import Priority
+from sevenbridges.http.recorder import FlightRecorder
+from sevenbridges.http.singleflight import SingleFlight
+from sevenbridges.http.transport import RequestsTransport
 import sevenbridges
 
 client_info = {
@@ -23,7 +36,12 @@ class HttpClient(object):
     """
 
     def __init__(self, url=None, token=None, oauth_token=None, config=None,
-                 timeout=None, retry=5):
+                 timeout=None, retry=5, rate_limiter=None,
+                 error_handlers=None, pool_maxsize=10, codec=None,
+                 metrics=True, conditional_cache=None, coalesce=False,
+                 transport=None, compress_threshold=None,
+                 request_deadline=None, hedging=None, circuit_breakers=None,
+                 retry_budget=None, idempotency=None, flight_recorder=True):
 
         if config is not None:
             url = config.api_url
@@ -34,17 +52,39 @@ class HttpClient(object):
             raise SbgError(message="Url is missing!")
 
         self.url = url.rstrip('/')
-        self._session = requests.Session()
-        self._session.mount(self.url, HTTPAdapter(
-            max_retries=Retry(total=retry, status_forcelist=[500, 503])
-        ))
+        if transport is None:
+            transport = self._default_transport(pool_maxsize, retry,
+                                                retry_budget)
+        self._transport = transport
         self.timeout = timeout
         self._limit = None
         self._remaining = None
         self._reset = None
-        self._request_id = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._rate_limiter = rate_limiter
+        self._rate_limiter_seeded = False
+        if error_handlers is None:
+            error_handlers = [RateLimitSleeper()]
+        self.error_handlers = list(error_handlers)
+        self.codec = codec if codec is not None else default_codec()
+        self._metrics = Metrics(self.url) if metrics else None
+        if flight_recorder is True:
+            flight_recorder = FlightRecorder()
+        elif flight_recorder is False:
+            flight_recorder = None
+        self._flight_recorder = flight_recorder
+        self.conditional_cache = conditional_cache
+        self._single_flight = SingleFlight() if coalesce else None
+        self.compress_threshold = compress_threshold
+        self.request_deadline = request_deadline
+        self.hedging = hedging
+        self.circuit_breakers = circuit_breakers
+        self.retry_budget = retry_budget
+        self.idempotency = idempotency
         self.headers = {
             'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
             'User-Agent':
                 'sevenbridges-python/{version} ({os}, Python/{python}; '
                 'requests/{requests})'.format(**client_info)
@@ -62,9 +102,35 @@ class HttpClient(object):
                         'provide at least one token value.'
             )
 
+    def _default_transport(self, pool_maxsize, retry, retry_budget):
+        return RequestsTransport(
+            self.url, pool_maxsize=pool_maxsize, retry=retry,
+            retry_budget=retry_budget, deadline=lambda: self.active_deadline
+        )
+
     @property
     def session(self):
-        return self._session
+        """
+        Requests session of the calling thread, changes made to it do not
+        apply to other threads, use configure_session for that.
+        """
+        return self._transport.session
+
+    def configure_session(self, fn):
+        """
+        Applies the callable to the requests session of every thread, e.g.
+        to set proxies, headers or mount adapters.
+        :param fn: Callable receiving a requests.Session.
+        """
+        configure = getattr(self._transport, 'configure_session', None)
+        if configure is None:
+            raise SbgError(message='Transport does not use requests '
+                                   'sessions.')
+        configure(fn)
+
+    @property
+    def transport(self):
+        return self._transport
 
     @property
     def limit(self):
@@ -78,62 +144,516 @@ class HttpClient(object):
     def reset_time(self):
         return self._reset
 
+    @property
+    def rate_limit_state(self):
+        """
+        Consistent snapshot of the aggregated rate limit view.
+        :return: Tuple of limit, remaining and reset time.
+        """
+        with self._lock:
+            return self._limit, self._remaining, self._reset
+
+    @property
+    def metrics(self):
+        """
+        Snapshot of the request metrics grouped by the request method and
+        the url template.
+        """
+        if self._metrics is None:
+            return {}
+        return self._metrics.snapshot()
+
+    def reset_metrics(self):
+        """
+        Discards all recorded request metrics.
+        """
+        if self._metrics is not None:
+            self._metrics.reset()
+
+    @property
+    def flight_recorder(self):
+        """
+        Recorder of the most recent requests, None if disabled.
+        """
+        return self._flight_recorder
+
+    @property
+    def context(self):
+        """
+        Context of the last request made by the calling thread.
+        """
+        return getattr(self._local, 'context', None)
+
     @property
     def request_id(self):
-        return self._request_id
+        """
+        Identifier of the last request made by the calling thread.
+        """
+        context = self.context
+        return context.request_id if context is not None else None
 
-    @check_for_error
-    def _request(self, verb, url, headers=None, params=None, data=None,
-                 append_base=False, stream=False):
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
+    def _seed_rate_limiter(self):
+        """
+        Seeds the rate limiter with the current state of the rate limit
+        fetched from the rate limit endpoint.
+        """
+        from sevenbridges.models.rate_limit import RateLimit
+
+        self._rate_limiter_seeded = True
+        try:
+            response = self._transport.request(
+                'GET', self.url + RateLimit._URL['get'], headers=self.headers,
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                rate = self.codec.loads(response.content).get('rate', {})
+                self._rate_limiter.update(
+                    limit=rate.get('limit'), remaining=rate.get('remaining'),
+                    reset=rate.get('reset')
+                )
+        except (requests.RequestException, ValueError):
+            # Pacer will be seeded from the headers of the first response.
+            pass
+
+    def _prepare_request(self, url, headers=None, append_base=False):
+        """
+        Resolves the request url and merges the default client headers with
+        the ones supplied for the single request.
+        :param url: Request url.
+        :param headers: Additional request headers.
+        :param append_base: If True api url will be prepended to the url.
+        :return: Tuple of resolved url and headers.
+        """
         if append_base:
             url = self.url + url
-        if not headers:
-            headers = self.headers
-        else:
-            headers = headers.update(self.headers)
-        if not self.token or self.oauth_token:
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        if not (self.token or self.oauth_token):
             raise SbgError(message="Api instance must be authenticated.")
-        if not stream:
-            response = self._session.request(
-                verb, url, params=params, data=json.dumps(data),
-                headers=headers, timeout=self.timeout, stream=stream
+        return url, request_headers
+
+    def _encode(self, data, headers):
+        """
+        Encodes the request body, bodies larger than the compression
+        threshold are gzip compressed.
+        :param data: Request data.
+        :param headers: Request headers, updated with the content encoding.
+        :return: Encoded body.
+        """
+        body = self.codec.dumps(data)
+        threshold = self.compress_threshold
+        if threshold is not None and data is not None and (
+                len(body) >= threshold):
+            body = gzip_compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        return body
+
+    def _decode(self, response, **kwargs):
+        """
+        Decodes the response body using the client codec.
+        :param response: Response object.
+        :return: Decoded body.
+        """
+        return self.codec.loads(response.content)
+
+    def _process_response(self, response):
+        """
+        Records the rate limit information and the request identifier
+        returned by the server. Context of the request is attached to the
+        response and stored for the calling thread, while the aggregated
+        rate limit view is updated atomically.
+        :param response: Response object.
+        :return: Response object.
+        """
+        self._local.attempts = getattr(self._local, 'attempts', 0) + 1
+        context = RequestContext.from_response(response)
+        response.context = context
+        response.json = functools.partial(self._decode, response)
+        self._local.context = context
+        if context.remaining is not None:
+            with self._lock:
+                if context.limit is not None:
+                    self._limit = context.limit
+                if self._reset is None or context.reset is None or (
+                        context.reset > self._reset):
+                    self._remaining = context.remaining
+                    self._reset = context.reset or self._reset
+                elif context.reset == self._reset:
+                    # Responses to concurrent requests arrive out of order,
+                    # within a window the budget only decreases.
+                    self._remaining = min(self._remaining, context.remaining)
+        if self._rate_limiter is not None:
+            self._rate_limiter.update(
+                limit=context.limit, remaining=context.remaining,
+                reset=context.reset
+            )
+        return response
+
+    def _record(self, verb, url, started, response, body, stream=False,
+                attempts=None, error=None):
+        """
+        Records the metrics of a finished request and adds it to the
+        flight recorder.
+        :param verb: Request method.
+        :param url: Request url.
+        :param started: Time the request was started at.
+        :param response: Response object, None if request failed.
+        :param body: Encoded request body.
+        :param stream: If True response body is not read.
+        :param attempts: Number of responses received, by default the count
+            kept for the calling thread is used.
+        :param error: Exception the request failed with.
+        """
+        latency = timeit.default_timer() - started
+        if attempts is None:
+            attempts = getattr(self._local, 'attempts', 1)
+        retries = max(attempts - 1, 0)
+        status_code = bytes_received = None
+        if response is not None:
+            status_code = response.status_code
+            history = getattr(
+                getattr(getattr(response, 'raw', None), 'retries', None),
+                'history', None
+            )
+            retries += len(history or ())
+            if getattr(response, 'from_cache', False):
+                # Revalidated responses carry no body over the wire.
+                status_code, bytes_received = 304, 0
+            elif stream:
+                bytes_received = int(
+                    response.headers.get('Content-Length', 0) or 0
+                )
+            else:
+                bytes_received = len(response.content or b'')
+        template = resolve_template(self.url, url)
+        bytes_sent = len(body) if body else 0
+        if self._metrics is not None:
+            self._metrics.record(
+                verb, url, latency, status_code=status_code, retries=retries,
+                bytes_sent=bytes_sent, bytes_received=bytes_received or 0,
+                template=template
             )
+        if self._flight_recorder is not None:
+            context = getattr(response, 'context', None)
+            self._flight_recorder.record(
+                verb, url, template, latency, status_code=status_code,
+                request_id=context.request_id if context else None,
+                retries=retries, bytes_sent=bytes_sent,
+                bytes_received=bytes_received or 0, error=error
+            )
+
+    def _revalidate(self, key, response):
+        """
+        Replaces the 304 response with the cached one, otherwise stores
+        the response in the conditional cache.
+        :param key: Cache key.
+        :param response: Response object.
+        :return: Response object.
+        """
+        if response.status_code == 304:
+            cached = self.conditional_cache.revalidated(key, response)
+            if cached is not None:
+                cached.context = response.context
+                cached.from_cache = True
+                cached.json = functools.partial(self._decode, cached)
+                return cached
         else:
-            response = self._session.request(
-                verb, url, params=params, stream=stream
+            self.conditional_cache.store(key, response)
+        return response
+
+    def _endpoint_group(self, url):
+        """
+        Groups the api urls by the top level resource, e.g. files or tasks,
+        other urls are grouped by the host.
+        """
+        if url.startswith(self.url):
+            path = urllib.parse.urlsplit(url[len(self.url):]).path
+            return path.strip('/').split('/')[0] or '/'
+        return urllib.parse.urlsplit(url).netloc
+
+    @property
+    def active_priority(self):
+        """
+        Request priority in effect for the calling thread.
+        """
+        return getattr(self._local, 'priority', None) or Priority.NORMAL
+
+    @contextlib.contextmanager
+    def priority(self, priority):
+        """
+        Sets the priority of all api calls made by the calling thread
+        within the block.
+        :param priority: Priority.HIGH or Priority.NORMAL.
+        """
+        outer = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = outer
+
+    @property
+    def active_deadline(self):
+        """
+        Deadline in effect for the calling thread.
+        """
+        return getattr(self._local, 'deadline', None)
+
+    @contextlib.contextmanager
+    def deadline(self, timeout=None):
+        """
+        Bounds the total duration of all api calls made by the calling
+        thread within the block, including retries, rate limit waits and
+        pagination. Nested deadlines can only shorten the outer one.
+        :param timeout: Time budget in seconds, None keeps the deadline
+            currently in effect.
+        :return: Deadline object or None.
+        """
+        outer = self.active_deadline
+        if timeout is None:
+            yield outer
+            return
+        deadline = Deadline.earliest(outer, Deadline(timeout))
+        self._local.deadline = deadline
+        try:
+            yield deadline
+        finally:
+            self._local.deadline = outer
+
+    def bind_context(self, fn):
+        """
+        Binds the callable to the deadline and priority in effect for the
+        calling thread, so work handed over to other threads runs within
+        the same bounds.
+        :param fn: Callable.
+        :return: Callable running fn with the captured deadline and
+            priority.
+        """
+        deadline = self.active_deadline
+        priority = getattr(self._local, 'priority', None)
+
+        def bound(*args, **kwargs):
+            outer = self.active_deadline, getattr(self._local, 'priority',
+                                                  None)
+            self._local.deadline, self._local.priority = deadline, priority
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.deadline, self._local.priority = outer
+
+        return bound
+
+    def _timeout(self):
+        """
+        Returns the timeout for the next attempt bounded by the deadline
+        in effect.
+        """
+        deadline = self.active_deadline
+        if deadline is None:
+            return self.timeout
+        deadline.check()
+        return deadline.cap(self.timeout)
+
+    def _send(self, verb, url, params, body, headers, priority, deadline):
+        """
+        Sends the request within the rate limit and applies the error
+        handlers to the response.
+        """
+        if self._rate_limiter is not None:
+            if not self._rate_limiter_seeded:
+                self._seed_rate_limiter()
+            self._rate_limiter.acquire(
+                max_wait=deadline and deadline.remaining(),
+                priority=priority
             )
-        headers = response.headers
-        self._limit = headers.get('X-RateLimit-Limit', self._limit)
-        self._remaining = headers.get('X-RateLimit-Remaining', self._remaining)
-        self._reset = headers.get('X-RateLimit-Reset', self._reset)
-        self._request_id = headers.get('X-Request-Id', self._request_id)
+        response = self._transport.request(
+            verb, url, params=params, data=body, headers=headers,
+            timeout=self._timeout()
+        )
+        self._process_response(response)
+        for error_handler in self.error_handlers:
+            response = error_handler(self, response)
         return response
 
+    @check_for_error
+    def _request(self, verb, url, headers=None, params=None, data=None,
+                 append_base=False, stream=False, priority=None):
+        url, headers = self._prepare_request(url, headers, append_base)
+        priority = priority or self.active_priority
+        self._local.attempts = 0
+        started = timeit.default_timer()
+        response = body = error = None
+        breaker = None
+        if self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.get(self._endpoint_group(url))
+            breaker.allow()
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+        with self.deadline(self.request_deadline) as deadline:
+            try:
+                if not stream:
+                    body = self._encode(data, headers)
+                    cache_key = None
+                    if self.conditional_cache is not None and verb == 'GET':
+                        cache_key = self.conditional_cache.key(url, params)
+                        headers.update(self.conditional_cache
+                                       .conditional_headers(cache_key))
+                    response = self._send(verb, url, params, body, headers,
+                                          priority, deadline)
+                    if cache_key is not None:
+                        response = self._revalidate(cache_key, response)
+                    if cache_key is not None and response.status_code == 304:
+                        # Cached entry was evicted after the validators were
+                        # sent, the resource is fetched unconditionally.
+                        headers.pop('If-None-Match', None)
+                        headers.pop('If-Modified-Since', None)
+                        response = self._send(verb, url, params, body,
+                                              headers, priority, deadline)
+                        response = self._revalidate(cache_key, response)
+                else:
+                    timeout = None if deadline is None else self._timeout()
+                    response = self._transport.request(
+                        verb, url, params=params, stream=stream,
+                        timeout=timeout
+                    )
+                    self._process_response(response)
+                if breaker is not None:
+                    breaker.record(response.status_code)
+                return response
+            except requests.RequestException as e:
+                error = e
+                # Retries stopped by the deadline surface as connection or
+                # retry errors rather than timeouts.
+                if deadline is not None and deadline.expired:
+                    error = DeadlineExceeded(
+                        message='Deadline of {} seconds exceeded.'.format(
+                            deadline.timeout)
+                    )
+                    raise error
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except SbgError as e:
+                error = e
+                raise
+            finally:
+                if self._metrics is not None or (
+                        self._flight_recorder is not None):
+                    self._record(verb, url, started, response, body, stream,
+                                 error=error)
+
     def get(self, url, headers=None, params=None, data=None, append_base=True,
-            stream=False):
+            stream=False, priority=None):
+        if self._single_flight is not None and not stream and not data:
+            params_key = tuple(sorted(
+                (k, str(v)) for k, v in (params or {}).items()
+            ))
+            key = (url, append_base, params_key,
+                   tuple(sorted((headers or {}).items())))
+            deadline = self.active_deadline
+            if self.request_deadline is not None:
+                deadline = Deadline.earliest(
+                    deadline, Deadline(self.request_deadline)
+                )
+            response, shared = self._single_flight.do(
+                key, functools.partial(
+                    self._get, url=url, headers=headers, params=params,
+                    append_base=append_base, priority=priority
+                ), deadline=deadline
+            )
+            if shared and response is not None:
+                self._local.context = response.context
+            return response
 
-        return self._request(
-            'GET', url=url, headers=headers, params=params, data=data,
-            append_base=append_base, stream=stream
+        return self._get(
+            url=url, headers=headers, params=params, data=data,
+            append_base=append_base, stream=stream, priority=priority
         )
 
+    def _get(self, url, headers=None, params=None, data=None,
+             append_base=True, stream=False, priority=None):
+        delay = None
+        if self.hedging is not None and not stream:
+            delay = self.hedging.delay(
+                self._metrics, 'GET', self.url + url if append_base else url
+            )
+        if delay is None:
+            return self._request(
+                'GET', url=url, headers=headers, params=params, data=data,
+                append_base=append_base, stream=stream, priority=priority
+            )
+
+        priority = priority or self.active_priority
+        call = self.bind_context(functools.partial(
+            self._request, 'GET', url=url, headers=headers, params=params,
+            data=data, append_base=append_base, priority=priority
+        ))
+        response = self.hedging.run(
+            call, delay, functools.partial(self._can_hedge, priority)
+        )
+        if response is not None:
+            self._local.context = response.context
+        return response
+
+    def _can_hedge(self, priority=Priority.NORMAL):
+        """
+        Hedged requests are sent only if the rate limit allows sending
+        them right away and the deadline has not passed.
+        """
+        deadline = self.active_deadline
+        if deadline is not None and deadline.expired:
+            return False
+        if self._rate_limiter is not None:
+            return self._rate_limiter.delay(priority) == 0
+        return self._remaining is None or self._remaining > 1
+
     def post(self, url, headers=None, params=None, data=None,
-             append_base=True):
+             append_base=True, priority=None):
         return self._request('POST', url=url, headers=headers, params=params,
-                             data=data, append_base=append_base)
+                             data=data, append_base=append_base,
+                             priority=priority)
 
-    def put(self, url, headers=None, params=None, data=None, append_base=True):
+    def put(self, url, headers=None, params=None, data=None, append_base=True,
+            priority=None):
         return self._request('PUT', url=url, headers=headers, params=params,
-                             data=data, append_base=append_base)
+                             data=data, append_base=append_base,
+                             priority=priority)
 
     def patch(self, url, headers=None, params=None, data=None,
-              append_base=True):
+              append_base=True, priority=None):
         return self._request('PATCH', url=url, headers=headers, params=params,
-                             data=data, append_base=append_base)
+                             data=data, append_base=append_base,
+                             priority=priority)
 
-    def delete(self, url, headers=None, params=None, append_base=True):
+    def delete(self, url, headers=None, params=None, append_base=True,
+               priority=None):
         return self._request('DELETE', url=url, headers=headers, params=params,
-                             data={}, append_base=append_base)
+                             data={}, append_base=append_base,
+                             priority=priority)
+
+    def idempotent(self, resource, send, reconcile, key=None):
+        """
+        Executes the non idempotent operation, retrying it safely if the
+        idempotency support is enabled.
+        :param resource: Class of the created resource.
+        :param send: Callable receiving the request headers, sends the
+            operation and returns the created resource.
+        :param reconcile: Callable receiving the utc datetime of the first
+            attempt and returning the resources the operation may have
+            created since.
+        :param key: Idempotency key, generated if not supplied.
+        :return: Created resource.
+        """
+        if self.idempotency is None:
+            return send({'Idempotency-Key': key} if key else None)
+        return self.idempotency.execute(
+            self, resource, key or Idempotency.new_key(), send, reconcile
+        )
 
     def __repr__(self):
         return '<API(%s) - "%s">' % (self.url, self.token)
@@ -0,0 +1,92 @@
+import gzip
+import io
+import json
+
+import six
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec(object):
+    """
+    Codec used to encode request bodies and decode response bodies.
+    Default implementation uses the standard library json module.
+    """
+    name = 'json'
+
+    def dumps(self, data):
+        return json.dumps(data)
+
+    def loads(self, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+    def __repr__(self):
+        return '<{}: {}>'.format(self.__class__.__name__, self.name)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec backed by the orjson package.
+    """
+    name = 'orjson'
+
+    def dumps(self, data):
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson is strict about dictionary keys and integer sizes.
+            return super(OrjsonCodec, self).dumps(data)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    Codec backed by the ujson package.
+    """
+    name = 'ujson'
+
+    def dumps(self, data):
+        return ujson.dumps(data)
+
+    def loads(self, content):
+        return ujson.loads(content)
+
+
+def default_codec():
+    """
+    Returns the fastest codec available in the environment.
+    :return: JsonCodec instance.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    if ujson is not None:
+        return UjsonCodec()
+    return JsonCodec()
+
+
+def gzip_compress(data, level=6):
+    """
+    Gzip compresses the encoded request body.
+    :param data: Request body.
+    :param level: Compression level in range 1 - 9.
+    :return: Compressed body.
+    """
+    if isinstance(data, six.text_type):
+        data = data.encode('utf-8')
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb',
+                       compresslevel=level) as f:
+        f.write(data)
+    return buffer.getvalue()
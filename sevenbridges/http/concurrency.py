@@ -0,0 +1,128 @@
+import threading
+import time
+
+from sevenbridges.errors import SbgError
+
+
+class AdaptiveConcurrency(object):
+    """
+    Additive increase, multiplicative decrease concurrency limiter. The
+    number of operations allowed in flight grows by one per window of
+    successful operations while latency stays close to the observed
+    baseline, and is cut multiplicatively on overload signals such as rate
+    limiting, server errors or rising latency.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, backoff=0.5,
+                 latency_tolerance=2.0, cooldown=1.0):
+        """
+        :param initial: Initial concurrency limit.
+        :param minimum: Lower bound of the limit.
+        :param maximum: Upper bound of the limit.
+        :param backoff: Factor the limit is multiplied by on overload.
+        :param latency_tolerance: Latency above this multiple of the
+            baseline latency is treated as overload.
+        :param cooldown: Min number of seconds between two decreases, so a
+            burst of failures of requests sent together cuts the limit once.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self._limit = float(max(min(initial, maximum), minimum))
+        self._in_flight = 0
+        self._baseline = None
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def try_acquire(self):
+        """
+        Takes a slot if one is free.
+        :return: True if the slot was taken.
+        """
+        with self._condition:
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        """
+        Blocks until a slot is free and takes it.
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency=None, overloaded=False):
+        """
+        Frees the slot and adapts the limit to the outcome of the operation.
+        :param latency: Duration of the operation in seconds.
+        :param overloaded: True if the operation failed due to overload.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease()
+            elif latency is not None:
+                self._observe(latency)
+            self._condition.notify_all()
+
+    def record_failure(self):
+        """
+        Records an overload signal without releasing a slot, e.g. a
+        failed attempt retried within the same operation.
+        """
+        with self._condition:
+            self._decrease()
+
+    def _observe(self, latency):
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Baseline slowly follows latency up, so a permanently slower
+            # network does not keep the limit down.
+            self._baseline += (latency - self._baseline) * 0.01
+        if latency > self._baseline * self.latency_tolerance:
+            self._decrease()
+        else:
+            self._limit = min(self._limit + 1.0 / self._limit, self.maximum)
+
+    def _decrease(self):
+        now = time.time()
+        if now - self._decreased < self.cooldown:
+            return
+        self._decreased = now
+        self._limit = max(self._limit * self.backoff, self.minimum)
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Executes the operation within a slot, api errors caused by rate
+        limiting, server errors and network failures count as overload.
+        """
+        self.acquire()
+        started = time.time()
+        overloaded = False
+        try:
+            return fn(*args, **kwargs)
+        except SbgError as e:
+            overloaded = e.status is None or e.status == 429 or (
+                e.status >= 500)
+            raise
+        finally:
+            self.release(time.time() - started, overloaded)
+
+    def __repr__(self):
+        return '<AdaptiveConcurrency: limit={}, in_flight={}>'.format(
+            self.limit, self._in_flight
+        )
@@ -0,0 +1,53 @@
+import six
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestContext(object):
+    """
+    Metadata of a single request returned by the server: request identifier
+    and the state of the rate limit at the time the request was handled.
+    """
+
+    def __init__(self, method=None, url=None, status_code=None,
+                 request_id=None, limit=None, remaining=None, reset=None):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.request_id = request_id
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Creates the context from the response headers.
+        :param response: Response object.
+        :return: RequestContext object.
+        """
+        headers = response.headers
+        request = getattr(response, 'request', None)
+        return cls(
+            method=getattr(request, 'method', None),
+            url=six.text_type(request.url) if request is not None else None,
+            status_code=response.status_code,
+            request_id=headers.get('X-Request-Id'),
+            limit=_to_int(headers.get('X-RateLimit-Limit')),
+            remaining=_to_int(headers.get('X-RateLimit-Remaining')),
+            reset=_to_int(headers.get('X-RateLimit-Reset'))
+        )
+
+    def __repr__(self):
+        return six.text_type(
+            '<RequestContext: request_id={request_id}, status={status}, '
+            'remaining={remaining}>'.format(
+                request_id=self.request_id, status=self.status_code,
+                remaining=self.remaining
+            )
+        )
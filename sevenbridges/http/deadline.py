@@ -0,0 +1,69 @@
+import time
+
+from sevenbridges.errors import DeadlineExceeded
+
+
+class Deadline(object):
+    """
+    Point in time by which an api call or a whole operation spanning
+    multiple calls, retries and pages has to complete.
+    """
+
+    def __init__(self, timeout):
+        """
+        :param timeout: Time budget in seconds.
+        """
+        self.timeout = timeout
+        self.expires = time.time() + timeout
+
+    @classmethod
+    def earliest(cls, *deadlines):
+        """
+        Returns the deadline that expires first, ignoring None values.
+        """
+        deadlines = [d for d in deadlines if d is not None]
+        if not deadlines:
+            return None
+        return min(deadlines, key=lambda deadline: deadline.expires)
+
+    def remaining(self):
+        """
+        :return: Seconds left until the deadline.
+        """
+        return max(self.expires - time.time(), 0)
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        Raises DeadlineExceeded if the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(
+                message='Deadline of {} seconds exceeded.'.format(
+                    self.timeout)
+            )
+
+    def cap(self, timeout):
+        """
+        Bounds the request timeout by the time left until the deadline.
+        :param timeout: Timeout in seconds or a tuple of connect and read
+            timeouts, None means no timeout.
+        :return: Bounded timeout of the same form.
+        """
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining if t is None else min(t, remaining)
+                for t in timeout
+            )
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def __repr__(self):
+        return '<Deadline: timeout={}, remaining={:.3f}>'.format(
+            self.timeout, self.remaining()
+        )
@@ -0,0 +1,94 @@
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+
+class RateLimitSleeper(object):
+    """
+    Error handler that waits until the rate limit window resets and
+    resubmits the request whenever the server responds with 429.
+
+    Error handlers are callables receiving the client and the response,
+    returning the (possibly new) response that is checked for errors.
+    """
+
+    def __init__(self, max_retries=10, max_wait=900, jitter=1.0,
+                 methods=IDEMPOTENT_METHODS):
+        """
+        :param max_retries: Maximum number of resubmissions.
+        :param max_wait: Longest single wait in seconds, if the server
+            requires a longer one the error is raised instead.
+        :param jitter: Upper bound of random seconds added to every wait so
+            that threads do not resubmit all at once.
+        :param methods: Http methods that can be safely resubmitted.
+        """
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self.methods = frozenset(method.upper() for method in methods)
+
+    @staticmethod
+    def wait_time(response):
+        """
+        Calculates the number of seconds until the request can be resent,
+        from the Retry-After or the X-RateLimit-Reset header.
+        :param response: Response object.
+        :return: Number of seconds or None if it can not be determined.
+        """
+        headers = response.headers
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                date = parsedate_tz(retry_after)
+                if date is not None:
+                    return max(mktime_tz(date) - time.time(), 0)
+        reset = headers.get('X-RateLimit-Reset')
+        if reset:
+            try:
+                return max(float(reset) - time.time(), 0)
+            except ValueError:
+                pass
+        return None
+
+    def _resubmittable(self, response, retries):
+        if response.status_code != 429 or retries >= self.max_retries:
+            return False
+        return response.request.method.upper() in self.methods
+
+    def __call__(self, api, response):
+        retries = 0
+        while self._resubmittable(response, retries):
+            wait = self.wait_time(response)
+            if wait is None or wait > self.max_wait:
+                break
+            deadline = api.active_deadline
+            if deadline is not None and wait > deadline.remaining():
+                break
+            # Resubmissions are retries like any other, they draw from the
+            # shared retry budget and pass the circuit breaker and pacer.
+            budget = api.retry_budget
+            if budget is not None and not budget.withdraw():
+                break
+            if api.circuit_breakers is not None:
+                api.circuit_breakers.get(
+                    api._endpoint_group(response.request.url)
+                ).allow()
+            wait += random.uniform(0, self.jitter)
+            if deadline is not None:
+                wait = min(wait, deadline.remaining())
+            time.sleep(wait)
+            if api.rate_limiter is not None:
+                api.rate_limiter.acquire(
+                    max_wait=deadline and deadline.remaining(),
+                    priority=api.active_priority
+                )
+            response = api.transport.send(
+                response.request, timeout=api._timeout()
+            )
+            api._process_response(response)
+            retries += 1
+        return response
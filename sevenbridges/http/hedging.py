@@ -0,0 +1,134 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Hedging(object):
+    """
+    Hedged request policy. When a request takes longer than the chosen
+    latency percentile of its endpoint, an identical request is sent and
+    the response that arrives first is used.
+    """
+
+    def __init__(self, percentile=95, min_delay=0.01, initial_delay=None,
+                 min_samples=20, max_workers=32):
+        """
+        :param percentile: Latency percentile after which the request is
+            hedged.
+        :param min_delay: Lower bound of the hedging delay in seconds.
+        :param initial_delay: Delay used until the endpoint has enough
+            latency samples, if None such requests are not hedged.
+        :param min_samples: Number of latency samples required before the
+            percentile is trusted.
+        :param max_workers: Max number of threads sending requests, when
+            all of them are busy requests are sent from the calling thread
+            and are not hedged.
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._busy = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def delay(self, metrics, method, url):
+        """
+        Computes the hedging delay for the request.
+        :param metrics: Metrics object or None.
+        :param method: Request method.
+        :param url: Request url.
+        :return: Delay in seconds or None if request should not be hedged.
+        """
+        delay = None
+        if metrics is not None:
+            delay = metrics.percentile(
+                method, url, self.percentile, min_count=self.min_samples
+            )
+        if delay is None:
+            delay = self.initial_delay
+        if delay is None:
+            return None
+        return max(delay, self.min_delay)
+
+    def _submit(self, call):
+        """
+        Submits the call if a pool thread is free, so calls never wait in
+        the pool queue.
+        :return: Tuple of the future and the event set once the call
+            starts, or None if all threads are busy.
+        """
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return None
+            self._busy += 1
+        started = threading.Event()
+
+        def run():
+            started.set()
+            try:
+                return call()
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+        return self.pool.submit(run), started
+
+    def run(self, call, delay, can_hedge):
+        """
+        Executes the call and hedges it if it does not complete in time.
+        :param call: Callable sending the request.
+        :param delay: Hedging delay in seconds, counted from the moment
+            the request is sent.
+        :param can_hedge: Callable returning True if the hedged request
+            may be sent.
+        :return: Result of the call that completed first.
+        """
+        submitted = self._submit(call)
+        if submitted is None:
+            # Client is saturated, hedging would only add more load.
+            return call()
+        primary, started = submitted
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not can_hedge():
+            return primary.result()
+        submitted = self._submit(call)
+        if submitted is None:
+            return primary.result()
+
+        hedge = submitted[0]
+        with self._lock:
+            self.hedged += 1
+        pending = [primary, hedge]
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=pending.index):
+                pending.remove(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return result
+        raise error
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
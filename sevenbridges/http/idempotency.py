@@ -0,0 +1,205 @@
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sevenbridges.errors import DeadlineExceeded, SbgError
+
+
+class Journal(object):
+    """
+    In memory journal of idempotent operations. Operation is pending from
+    the first attempt until its outcome is known, completed operations
+    keep the reference to the created resource.
+    """
+    PENDING = 'pending'
+    DONE = 'done'
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def _write(self, key, entry):
+        pass
+
+    def _set(self, key, entry):
+        with self._lock:
+            if entry is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = entry
+            self._write(key, entry)
+
+    def pending(self, key, started):
+        """
+        :param key: Idempotency key.
+        :param started: Timestamp of the first attempt, only resources
+            created after it are considered by reconciliation.
+        """
+        self._set(key, {'state': self.PENDING, 'started': started})
+
+    def done(self, key, result):
+        """
+        :param key: Idempotency key.
+        :param result: Dictionary identifying the created resource.
+        """
+        self._set(key, {'state': self.DONE, 'result': result})
+
+    def discard(self, key):
+        self._set(key, None)
+
+    def claimed(self):
+        """
+        :return: Set of hrefs of resources created by journaled operations.
+        """
+        with self._lock:
+            return set(
+                entry['result'].get('href')
+                for entry in self._entries.values()
+                if entry['state'] == self.DONE
+            )
+
+
+class FileJournal(Journal):
+    """
+    Journal persisted to a file as json lines, so operations interrupted
+    by a crash are reconciled when the job is restarted.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Journal file path.
+        """
+        super(FileJournal, self).__init__()
+        self.path = path
+        try:
+            with open(path) as fp:
+                for line in fp:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record['entry'] is None:
+                        self._entries.pop(record['key'], None)
+                    else:
+                        self._entries[record['key']] = record['entry']
+        except IOError:
+            pass
+
+    def _write(self, key, entry):
+        with open(self.path, 'a') as fp:
+            fp.write(json.dumps({'key': key, 'entry': entry}) + '\n')
+            fp.flush()
+
+
+class Idempotency(object):
+    """
+    Makes non idempotent POST operations safe to retry. Every operation
+    carries a client generated key sent in the Idempotency-Key header and
+    recorded in the journal. When the outcome of an attempt is unknown,
+    e.g. the connection dropped before the response arrived, the operation
+    is reconciled by querying the server for the resource it would have
+    created before it is sent again. Only resources created after the
+    first attempt of the operation are considered.
+    """
+
+    def __init__(self, journal=None, retries=3, backoff=1.0, skew=10.0):
+        """
+        :param journal: Journal instance, in memory journal by default.
+        :param retries: Number of retries of failed operations.
+        :param backoff: Initial delay between retries in seconds.
+        :param skew: Tolerated difference between the client and server
+            clocks in seconds.
+        """
+        self.journal = journal if journal is not None else Journal()
+        self.retries = retries
+        self.backoff = backoff
+        self.skew = skew
+
+    @staticmethod
+    def new_key():
+        return str(uuid.uuid4())
+
+    @staticmethod
+    def is_transient(error):
+        """
+        Errors after which the operation may or may not have happened, or
+        that are safe to retry.
+        """
+        return error.status is None or error.status == 429 or (
+            error.status >= 500)
+
+    def _complete(self, key, obj):
+        result = dict(
+            (field, getattr(obj, field, None)) for field in ('href', 'id')
+            if getattr(obj, field, None) is not None
+        )
+        self.journal.done(key, result)
+        return obj
+
+    def _reconcile(self, reconcile, started):
+        claimed = self.journal.claimed()
+        since = datetime.utcfromtimestamp(started - self.skew)
+        for candidate in reconcile(since):
+            if candidate.href not in claimed:
+                return candidate
+        return None
+
+    def execute(self, api, resource, key, send, reconcile):
+        """
+        Executes the operation at most once.
+        :param api: Api instance.
+        :param resource: Class of the created resource.
+        :param key: Idempotency key.
+        :param send: Callable receiving the request headers, sends the
+            operation and returns the created resource.
+        :param reconcile: Callable receiving the utc datetime of the first
+            attempt and returning the resources the operation may have
+            created since.
+        :return: Created resource.
+        """
+        entry = self.journal.get(key)
+        if entry is not None and entry['state'] == Journal.DONE:
+            return resource(api=api, **entry['result'])
+        uncertain = entry is not None
+        if uncertain:
+            started = entry['started']
+        else:
+            started = time.time()
+            self.journal.pending(key, started)
+        deadline = api.active_deadline
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                backoff = self.backoff * 2 ** (attempt - 1)
+                if deadline is not None:
+                    backoff = min(backoff, deadline.remaining())
+                time.sleep(backoff)
+            if uncertain:
+                found = self._reconcile(reconcile, started)
+                if found is not None:
+                    return self._complete(key, found)
+            try:
+                return self._complete(key, send({'Idempotency-Key': key}))
+            except DeadlineExceeded:
+                # Request may have been applied before the deadline passed,
+                # the pending entry is kept to be reconciled by a rerun.
+                raise
+            except SbgError as e:
+                if not self.is_transient(e):
+                    if uncertain:
+                        # Conflict may be caused by an earlier attempt.
+                        found = self._reconcile(reconcile, started)
+                        if found is not None:
+                            return self._complete(key, found)
+                    self.journal.discard(key)
+                    raise
+                error = e
+                uncertain = uncertain or error.status != 429
+        if not uncertain:
+            self.journal.discard(key)
+        raise error
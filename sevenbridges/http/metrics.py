@@ -0,0 +1,259 @@
+import re
+import threading
+
+import six
+from six.moves import urllib
+
+# Placeholders match one or more path segments (project and app identifiers
+# contain slashes) unless a narrower pattern is known for them.
+PLACEHOLDER_PATTERNS = {
+    'revision': r'\d+',
+}
+DEFAULT_PLACEHOLDER_PATTERN = r'.+?'
+
+# Latency histogram bucket upper bounds in seconds, from 1ms to ~2 minutes.
+LATENCY_BUCKETS = tuple(0.001 * 2 ** i for i in range(18))
+
+
+class UrlTemplates(object):
+    """
+    Registry of resource url templates used to map concrete request urls
+    back to the template they were created from, e.g. /files/{id}.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._ordered = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile(template):
+        pattern = ''
+        position = 0
+        for match in re.finditer(r'{(\w+)}', template):
+            pattern += re.escape(template[position:match.start()])
+            pattern += '(?:{})'.format(PLACEHOLDER_PATTERNS.get(
+                match.group(1), DEFAULT_PLACEHOLDER_PATTERN))
+            position = match.end()
+        pattern += re.escape(template[position:])
+        return re.compile('^{}$'.format(pattern))
+
+    @staticmethod
+    def _literals(template):
+        segments = re.sub(r'{\w+}', '', template).split('/')
+        return len([segment for segment in segments if segment])
+
+    def register(self, templates):
+        """
+        Registers url templates.
+        :param templates: Iterable of url templates.
+        """
+        with self._lock:
+            for template in templates:
+                if template in self._templates:
+                    continue
+                self._templates[template] = self._compile(template)
+            # Templates with more literal segments and then more
+            # placeholders are more specific and are matched first.
+            self._ordered = sorted(
+                self._templates.items(),
+                key=lambda item: (-self._literals(item[0]),
+                                  -item[0].count('{'))
+            )
+
+    def resolve(self, path):
+        """
+        Finds the template matching the url path.
+        :param path: Url path relative to the api url.
+        :return: Template or None if no template matches.
+        """
+        for template, pattern in self._ordered:
+            if pattern.match(path):
+                return template
+        return None
+
+
+url_templates = UrlTemplates()
+
+
+def resolve_template(base_url, url, templates=url_templates):
+    """
+    Maps the concrete request url to the url template.
+    :param base_url: Api url, urls of other hosts are external.
+    :param url: Request url.
+    :param templates: Url templates registry.
+    :return: Url template.
+    """
+    url = six.text_type(url)
+    if not url.startswith(base_url):
+        return '<external>'
+    path = urllib.parse.urlsplit(url[len(base_url):]).path or '/'
+    template = templates.resolve(path)
+    return template if template is not None else path
+
+
+class Histogram(object):
+    """
+    Fixed bucket histogram used for latency percentiles.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent):
+        """
+        Approximates the percentile with the upper bound of the bucket
+        it falls in.
+        :param percent: Percentile in range 0 - 100.
+        :return: Value or None if histogram is empty.
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                if i < len(self.buckets):
+                    return min(self.buckets[i], self.max)
+                return self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class EndpointMetrics(object):
+    """
+    Metrics aggregated for a single request method and url template.
+    """
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = {}
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def snapshot(self):
+        return {
+            'count': self.latency.count,
+            'latency': self.latency.snapshot(),
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+        }
+
+
+class Metrics(object):
+    """
+    Thread safe request metrics recorder. Requests are grouped by the
+    request method and the url template, e.g. 'GET /files/{id}'.
+    """
+
+    def __init__(self, url, templates=url_templates):
+        """
+        :param url: Api url, requests to other hosts are grouped together.
+        :param templates: Url templates registry.
+        """
+        self.url = url.rstrip('/')
+        self.templates = templates
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def template(self, url):
+        """
+        Maps the concrete request url to the url template.
+        :param url: Request url.
+        :return: Url template.
+        """
+        return resolve_template(self.url, url, self.templates)
+
+    def record(self, method, url, latency, status_code=None, retries=0,
+               bytes_sent=0, bytes_received=0, template=None):
+        """
+        Records a finished request.
+        :param method: Request method.
+        :param url: Request url.
+        :param latency: Request duration in seconds, including retries.
+        :param status_code: Response status code, None if request failed.
+        :param retries: Number of times the request was resent.
+        :param bytes_sent: Size of the request body.
+        :param bytes_received: Size of the response body.
+        :param template: Url template if already resolved.
+        """
+        if template is None:
+            template = self.template(url)
+        key = '{} {}'.format(method.upper(), template)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = EndpointMetrics()
+            endpoint.latency.add(latency)
+            endpoint.statuses[status_code] = endpoint.statuses.get(
+                status_code, 0) + 1
+            endpoint.retries += retries
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+
+    def percentile(self, method, url, percent, min_count=1):
+        """
+        Returns the latency percentile of the endpoint the url belongs to.
+        :param method: Request method.
+        :param url: Request url.
+        :param percent: Percentile in range 0 - 100.
+        :param min_count: Minimal number of recorded requests.
+        :return: Latency in seconds or None if not enough requests were
+            recorded.
+        """
+        key = '{} {}'.format(method.upper(), self.template(url))
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None or endpoint.latency.count < min_count:
+                return None
+            return endpoint.latency.percentile(percent)
+
+    def snapshot(self):
+        """
+        Returns a point in time copy of all recorded metrics.
+        :return: Dictionary keyed by method and url template.
+        """
+        with self._lock:
+            return dict(
+                (key, endpoint.snapshot())
+                for key, endpoint in self._endpoints.items()
+            )
+
+    def reset(self):
+        """
+        Discards all recorded metrics.
+        """
+        with self._lock:
+            self._endpoints = {}
@@ -0,0 +1,217 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+from sevenbridges.errors import SbgError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class Priority(object):
+    """
+    Request priorities. High priority requests skip the pacing queue and
+    may use the capacity reserved for them, normal priority requests are
+    spread over the rest of the rate limit window.
+    """
+    HIGH = 'high'
+    NORMAL = 'normal'
+
+
+class RateLimiter(object):
+    """
+    Request pacer shared by all threads using the same client.
+
+    Pacer is seeded with the rate limit reported by the server and keeps
+    track of the remaining requests in the current rate limit window.
+    Requests are spread evenly over the time left until the window resets,
+    allowing at most `burst` requests to be sent back to back, so that the
+    client sustains the maximum allowed throughput without ever exceeding
+    the rate limit.
+    """
+
+    def __init__(self, burst=10, reserve=0.0):
+        """
+        :param burst: Number of requests that can be sent without pacing.
+        :param reserve: Fraction of the rate limit reserved for high
+            priority requests.
+        """
+        self.burst = max(int(burst), 1)
+        self.reserve = reserve
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self._arrival = 0.0
+        self._lock = threading.Lock()
+
+    def _state(self):
+        """
+        Guards the pacer state.
+        """
+        return self._lock
+
+    @property
+    def seeded(self):
+        return self.remaining is not None and self.reset is not None
+
+    def update(self, limit=None, remaining=None, reset=None):
+        """
+        Updates the pacer state with the rate limit information
+        returned by the server.
+        :param limit: Number of requests allowed in a rate limit window.
+        :param remaining: Number of requests remaining in the window.
+        :param reset: Window reset time in epoch seconds.
+        """
+        with self._state():
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is None:
+                return
+            remaining = int(remaining)
+            reset = int(reset) if reset is not None else self.reset
+            if self.reset is None or (
+                    reset is not None and reset > self.reset):
+                # New window, server view replaces the local one.
+                self.reset = reset
+                self.remaining = remaining
+            elif self.remaining is None or remaining < self.remaining:
+                # Requests sent by other threads (or clients sharing the
+                # token) can only decrease the remaining budget.
+                self.remaining = remaining
+
+    def _reserve(self, priority=Priority.NORMAL):
+        """
+        Reserves a request slot.
+        :return: Tuple of the delay in seconds and a flag telling whether
+            the slot was reserved, callers that got no slot have to try
+            again after the delay.
+        """
+        now = time.time()
+        if self.reset is not None and now >= self.reset:
+            # Window has passed, budget is replenished until server
+            # reports the next reset time.
+            self.remaining = self.limit
+            self.reset = None
+        if not self.seeded:
+            # Until the server reports the new window only the known
+            # budget is counted down, there is nothing to pace against.
+            if self.remaining:
+                self.remaining -= 1
+            return 0, True
+        if priority == Priority.HIGH and self.remaining > 0:
+            self.remaining -= 1
+            return 0, True
+        reserved = int((self.limit or 0) * self.reserve)
+        available = self.remaining - reserved
+        if available <= 0:
+            # Nothing is reserved, callers wait for the reset and compete
+            # for the replenished budget, pacing resumes from the reset.
+            self._arrival = max(self._arrival, self.reset)
+            return self.reset - now, False
+
+        interval = (self.reset - now) / available
+        tolerance = (self.burst - 1) * interval
+        arrival = max(self._arrival, now)
+        self._arrival = arrival + interval
+        self.remaining -= 1
+        return max(arrival - tolerance - now, 0), True
+
+    def delay(self, priority=Priority.NORMAL):
+        """
+        Time the next request would have to wait for, nothing is reserved.
+        :param priority: Request priority.
+        :return: Delay in seconds.
+        """
+        with self._state():
+            state = self.limit, self.remaining, self.reset, self._arrival
+            try:
+                return self._reserve(priority)[0]
+            finally:
+                self.limit, self.remaining, self.reset, self._arrival = state
+
+    def acquire(self, max_wait=None, priority=Priority.NORMAL):
+        """
+        Blocks the calling thread until the request can be sent.
+        :param max_wait: Upper bound of the time spent waiting in seconds.
+        :param priority: Request priority.
+        :return: Time the request had to wait for in seconds, may be larger
+            than the time actually spent waiting if max_wait is set.
+        """
+        waited = 0
+        while True:
+            with self._state():
+                delay, reserved = self._reserve(priority)
+            if max_wait is not None and waited + delay > max_wait:
+                time.sleep(max(max_wait - waited, 0))
+                return waited + delay
+            if delay > 0:
+                time.sleep(delay)
+                waited += delay
+            if reserved:
+                return waited
+
+    def __repr__(self):
+        return '<RateLimiter: limit={}, remaining={}, reset={}>'.format(
+            self.limit, self.remaining, self.reset
+        )
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Rate limiter whose state is kept in a file shared by all processes on
+    the host using the same token. Access to the state is serialized with
+    an exclusive file lock, so requests of all processes are paced against
+    a single view of the remaining rate limit.
+    """
+
+    def __init__(self, path, burst=10, reserve=0.0):
+        """
+        :param path: State file path, the same for all processes sharing
+            the budget.
+        :param burst: Number of requests that can be sent without pacing.
+        :param reserve: Fraction of the rate limit reserved for high
+            priority requests.
+        """
+        if fcntl is None:
+            raise SbgError(
+                message='Shared rate limiter requires file locking support.'
+            )
+        super(SharedRateLimiter, self).__init__(burst=burst, reserve=reserve)
+        self.path = path
+
+    def _load(self, fd):
+        content = os.read(fd, 4096)
+        state = json.loads(content.decode('utf-8')) if content else {}
+        self.limit = state.get('limit')
+        self.remaining = state.get('remaining')
+        self.reset = state.get('reset')
+        self._arrival = state.get('arrival', 0.0)
+
+    def _store(self, fd):
+        content = json.dumps({
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset': self.reset,
+            'arrival': self._arrival,
+        }).encode('utf-8')
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, content)
+
+    @contextlib.contextmanager
+    def _state(self):
+        # The file is opened for every access, locks held through file
+        # descriptors inherited by forked processes would not exclude them.
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._load(fd)
+                yield
+                self._store(fd)
+            finally:
+                os.close(fd)
@@ -0,0 +1,91 @@
+import contextlib
+import json
+import time
+from collections import deque
+
+FIELDS = (
+    'time', 'method', 'url', 'template', 'status', 'request_id', 'latency',
+    'retries', 'bytes_sent', 'bytes_received', 'error'
+)
+
+
+class FlightRecorder(object):
+    """
+    Bounded ring buffer of the most recent requests kept for post-mortem
+    analysis of slow or failed jobs. Recording a request only appends a
+    tuple to the buffer, records are converted to dictionaries when they
+    are read or dumped.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        :param capacity: Number of most recent requests kept.
+        """
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+
+    def record(self, method, url, template, latency, status_code=None,
+               request_id=None, retries=0, bytes_sent=0, bytes_received=0,
+               error=None):
+        """
+        Records a finished request.
+        :param method: Request method.
+        :param url: Request url.
+        :param template: Url template of the request url.
+        :param latency: Request duration in seconds, including retries.
+        :param status_code: Response status code, None if request failed.
+        :param request_id: Request identifier returned by the server.
+        :param retries: Number of times the request was resent.
+        :param bytes_sent: Size of the request body.
+        :param bytes_received: Size of the response body.
+        :param error: Exception the request failed with.
+        """
+        # Appending to a bounded deque is atomic, no lock is needed.
+        self._records.append((
+            time.time() - latency, method.upper(), url, template,
+            status_code, request_id, latency, retries, bytes_sent,
+            bytes_received, type(error).__name__ if error else None
+        ))
+
+    def records(self):
+        """
+        Returns the recorded requests, oldest first.
+        :return: List of dictionaries.
+        """
+        return [dict(zip(FIELDS, record)) for record in list(self._records)]
+
+    def dump(self, path=None):
+        """
+        Dumps the recorded requests to json.
+        :param path: File the records are written to.
+        :return: Json string if path is not given, otherwise the path.
+        """
+        data = json.dumps(self.records(), indent=2)
+        if path is None:
+            return data
+        with open(path, 'w') as fp:
+            fp.write(data)
+        return path
+
+    @contextlib.contextmanager
+    def dump_on_error(self, path):
+        """
+        Dumps the recorded requests to the file if the block raises.
+        :param path: File the records are written to.
+        """
+        try:
+            yield self
+        except Exception:
+            self.dump(path)
+            raise
+
+    def clear(self):
+        self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return '<FlightRecorder: {}/{} requests>'.format(
+            len(self._records), self.capacity
+        )
@@ -0,0 +1,65 @@
+import threading
+
+from sevenbridges.errors import DeadlineExceeded
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical concurrent calls. The first caller for a key
+    executes the call while the callers arriving before it finishes wait
+    and share its result or exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, deadline=None):
+        """
+        Executes the call unless an identical one is already in flight.
+        :param key: Hashable call identifier.
+        :param fn: Callable to execute.
+        :param deadline: Deadline of the caller, bounds the time spent
+            waiting for the call in flight.
+        :return: Tuple of the call result and a flag that is True if the
+            result is shared with another caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                leader = True
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            timeout = deadline.remaining() if deadline is not None else None
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded(
+                    message='Deadline of {} seconds exceeded.'.format(
+                        deadline.timeout)
+                )
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,372 @@
+"""
+Transports send the prepared requests over the wire and return
+requests.Response objects, so error checking and rate limit bookkeeping in
+the HttpClient do not depend on the underlying http library.
+"""
+import io
+import threading
+import weakref
+
+import requests
+import six
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from sevenbridges.errors import SbgError
+from sevenbridges.http.circuit import BudgetRetry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class Transport(object):
+    """
+    Base transport, subclasses implement the request method.
+    """
+
+    session = None
+
+    def request(self, method, url, params=None, data=None, headers=None,
+                timeout=None, stream=False):
+        """
+        Sends the request.
+        :param method: Request method.
+        :param url: Request url.
+        :param params: Query parameters.
+        :param data: Encoded request body.
+        :param headers: Request headers.
+        :param timeout: Request timeout.
+        :param stream: If True response body is not read upfront.
+        :return: requests.Response object.
+        """
+        raise NotImplementedError
+
+    def send(self, request, timeout=None):
+        """
+        Resends the prepared request taken from a previous response.
+        :param request: requests.PreparedRequest object.
+        :param timeout: Request timeout.
+        :return: requests.Response object.
+        """
+        return self.request(
+            request.method, request.url, data=request.body,
+            headers=dict(request.headers), timeout=timeout
+        )
+
+    def close(self):
+        pass
+
+
+class SessionPool(object):
+    """
+    Hands out a requests.Session per thread. All sessions share the same
+    adapters and therefore the same connection pools and limits, while
+    session state such as cookies is never touched by two threads at once.
+    Attributes and methods of the calling thread's session are available
+    on the pool itself.
+    """
+
+    def __init__(self, adapters):
+        """
+        :param adapters: Dictionary of adapters keyed by the url prefix
+            they are mounted on.
+        """
+        self.adapters = adapters
+        self._local = threading.local()
+        # Sessions are owned by the thread locals and dropped when their
+        # thread exits, they are tracked only to be closed on close().
+        self._sessions = weakref.WeakSet()
+        self._configure = []
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Session of the calling thread.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            for prefix, adapter in self.adapters.items():
+                session.mount(prefix, adapter)
+            with self._lock:
+                for configure in self._configure:
+                    configure(session)
+                self._sessions.add(session)
+            self._local.session = session
+        return session
+
+    def configure(self, fn):
+        """
+        Applies the callable to the sessions of all threads, existing ones
+        and those created later.
+        :param fn: Callable receiving a requests.Session.
+        """
+        with self._lock:
+            self._configure.append(fn)
+            sessions = list(self._sessions)
+        for session in sessions:
+            fn(session)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def close(self):
+        """
+        Closes all sessions and the connections held by the adapters.
+        """
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        for adapter in self.adapters.values():
+            adapter.close()
+
+
+class RequestsTransport(Transport):
+    """
+    Default transport backed by requests sessions, one per thread, sharing
+    a pooled adapter that retries server errors.
+    """
+
+    def __init__(self, url, pool_maxsize=10, retry=5, session=None,
+                 retry_budget=None, deadline=None):
+        """
+        :param url: Api url the adapter is mounted on.
+        :param pool_maxsize: Size of the connection pool.
+        :param retry: Number of retries.
+        :param session: Optional requests.Session instance shared by all
+            threads instead of the per thread sessions.
+        :param retry_budget: RetryBudget shared with other transports.
+        :param deadline: Callable returning the deadline in effect for the
+            calling thread, no retries are made once it has passed.
+        """
+        max_retries = BudgetRetry(total=retry, status_forcelist=[500, 503])
+        max_retries.budget = retry_budget
+        max_retries.deadline = deadline
+        adapter = HTTPAdapter(
+            pool_maxsize=pool_maxsize, max_retries=max_retries
+        )
+        if session is not None:
+            session.mount(url, adapter)
+            self._sessions = None
+            self._session = session
+        else:
+            self._sessions = SessionPool({url: adapter})
+
+    @property
+    def session(self):
+        if self._sessions is None:
+            return self._session
+        return self._sessions.session
+
+    def request(self, method, url, params=None, data=None, headers=None,
+                timeout=None, stream=False):
+        return self.session.request(
+            method, url, params=params, data=data, headers=headers,
+            timeout=timeout, stream=stream
+        )
+
+    def send(self, request, timeout=None):
+        return self.session.send(request, timeout=timeout)
+
+    def configure_session(self, fn):
+        """
+        Applies the callable to the session of every thread.
+        :param fn: Callable receiving a requests.Session.
+        """
+        if self._sessions is None:
+            fn(self._session)
+        else:
+            self._sessions.configure(fn)
+
+    def close(self):
+        if self._sessions is None:
+            self._session.close()
+        else:
+            self._sessions.close()
+
+
+def _prepare(method, url, headers=None, body=None):
+    request = requests.PreparedRequest()
+    request.prepare(method=method, url=url, headers=headers)
+    request.body = body
+    return request
+
+
+def build_response(request, status_code, headers=None, content=b'',
+                   raw=None):
+    """
+    Builds the requests.Response object.
+    :param request: requests.PreparedRequest object.
+    :param status_code: Response status code.
+    :param headers: Response headers.
+    :param content: Response body, ignored if raw stream is given.
+    :param raw: File like object the body is streamed from.
+    :return: requests.Response object.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = request.url
+    response.request = request
+    response.encoding = requests.utils.get_encoding_from_headers(
+        response.headers)
+    if raw is not None:
+        response.raw = raw
+    else:
+        response._content = content
+        response._content_consumed = True
+    return response
+
+
+class _StreamReader(io.RawIOBase):
+    """
+    File like wrapper around an iterator of body chunks.
+    """
+
+    def __init__(self, chunks, close=None):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self._close = close
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+        super(_StreamReader, self).close()
+
+
+class HttpxTransport(Transport):
+    """
+    Transport backed by the httpx package. With HTTP/2 enabled concurrent
+    requests are multiplexed over a single connection per host, which
+    requires the httpx[http2] extra.
+    """
+
+    def __init__(self, http2=True, retry=5, max_connections=100,
+                 client=None, retry_budget=None):
+        """
+        :param http2: If True HTTP/2 is negotiated with the server.
+        :param retry: Number of retries of connection and server errors.
+        :param max_connections: Max number of concurrent connections.
+        :param client: Optional httpx.Client instance.
+        :param retry_budget: RetryBudget shared with other transports.
+        """
+        if httpx is None:
+            raise SbgError(
+                message='Httpx transport requires the httpx package.'
+            )
+        if client is None:
+            try:
+                client = httpx.Client(
+                    http2=http2,
+                    limits=httpx.Limits(max_connections=max_connections),
+                    transport=httpx.HTTPTransport(
+                        http2=http2, retries=retry
+                    )
+                )
+            except ImportError:
+                raise SbgError(
+                    message='HTTP/2 support requires the httpx[http2] extra.'
+                )
+        self.client = client
+        self.retry = retry
+        self.retry_budget = retry_budget
+
+    def request(self, method, url, params=None, data=None, headers=None,
+                timeout=None, stream=False):
+        if params:
+            params = dict(
+                (k, v) for k, v in params.items() if v is not None
+            )
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        try:
+            request = self.client.build_request(
+                method, url, params=params, content=data, headers=headers,
+                timeout=timeout
+            )
+            response = self.client.send(request, stream=stream)
+            for _ in range(self.retry):
+                if stream or response.status_code not in (500, 503):
+                    break
+                budget = self.retry_budget
+                if budget is not None and not budget.withdraw():
+                    break
+                response = self.client.send(request)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e))
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(str(e))
+
+        prepared = _prepare(
+            method, str(request.url), headers=headers, body=data
+        )
+        if stream:
+            return build_response(
+                prepared, response.status_code, response.headers,
+                raw=_StreamReader(response.iter_bytes(), response.close)
+            )
+        return build_response(
+            prepared, response.status_code, response.headers,
+            content=response.content
+        )
+
+    def close(self):
+        self.client.close()
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport dispatching the requests to a handler in the same process,
+    used in tests and benchmarks.
+    """
+
+    def __init__(self, handler):
+        """
+        :param handler: Callable receiving the requests.PreparedRequest and
+            returning a tuple of status code, headers and body. Body may be
+            bytes, text or a json serializable object.
+        """
+        self.handler = handler
+
+    def request(self, method, url, params=None, data=None, headers=None,
+                timeout=None, stream=False):
+        request = requests.Request(method, url, params=dict(
+            (k, v) for k, v in (params or {}).items() if v is not None
+        )).prepare()
+        request.prepare_headers(headers)
+        request.body = data
+        status_code, response_headers, body = self.handler(request)
+        if isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+        elif not isinstance(body, bytes) and body is not None:
+            body = requests.compat.json.dumps(body).encode('utf-8')
+        return build_response(
+            request, status_code, response_headers, content=body or b''
+        )
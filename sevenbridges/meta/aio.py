@@ -0,0 +1,176 @@
+"""
+Asyncio counterparts of the resource and collection base classes.
+Requires Python 3.6+.
+"""
+from sevenbridges.errors import SbgError, PaginationError
+from sevenbridges.meta.collection import Collection
+from sevenbridges.meta.data import DataContainer, projection
+from sevenbridges.meta.resource import Resource
+
+
+class AsyncDataContainer(DataContainer):
+    """
+    Data container that never blocks the event loop. Missing fields are not
+    fetched lazily, resource has to be reloaded explicitly instead.
+    """
+
+    def fetch(self):
+        pass
+
+    async def fetch_async(self):
+        href = self.data.get('href', None)
+        if href is not None:
+            response = await self.api.get(href, append_base=False)
+        else:
+            resource_id = self.data.get('id', None)
+            if resource_id is None:
+                return
+            response = await self.api.get(
+                self._URL['get'].format(id=resource_id), append_base=True
+            )
+        self.data = response.json()
+        self.fetched = True
+
+
+class AsyncCollection(Collection):
+    """
+    Collection whose pagination methods are coroutines.
+    """
+
+    async def all(self):
+        """
+        Asynchronously iterates over all available items.
+        :return: Async generator.
+        """
+        page = await self._load(self.href)
+        while True:
+            try:
+                for item in page._items:
+                    yield item
+                page = await page.next_page()
+            except PaginationError:
+                break
+
+    async def _load(self, url):
+        if self.resource is None:
+            raise NotImplementedError('Undefined collection resource.')
+        else:
+            response = await self._api.get(
+                url, params=self._projection_params(url), append_base=False
+            )
+            return self.from_response(
+                self.resource, response, self._api, raw=self.raw,
+                fields=self.fields
+            )
+
+    async def next_page(self):
+        """
+        Fetches next result set.
+        :return: AsyncCollection object.
+        """
+        for link in self.links:
+            if link.rel.lower() == 'next':
+                return await self._load(link.href)
+        raise PaginationError('No more entries.')
+
+    async def previous_page(self):
+        """
+        Fetches previous result set.
+        :return: AsyncCollection object.
+        """
+        for link in self.links:
+            if link.rel.lower() == 'prev':
+                return await self._load(link.href)
+        raise PaginationError('No more entries.')
+
+
+# noinspection PyProtectedMember,PyAttributeOutsideInit
+class AsyncResource(Resource):
+    """
+    Base class for asyncio resources. It has to be listed after the
+    synchronous resource class so that the query methods of the resource
+    become awaitable.
+    """
+    _data_container = AsyncDataContainer
+
+    @classmethod
+    async def _query(cls, **kwargs):
+        """
+        Generic query implementation that is used
+        by the resources.
+        """
+        api = kwargs.pop('api', cls._API)
+        url = kwargs.pop('url')
+        raw = kwargs.pop('raw', False)
+        fields = projection(kwargs.pop('fields', None))
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        response = await api.get(url=url, params=kwargs)
+        return AsyncCollection.from_response(cls, response, api, raw=raw,
+                                             fields=fields)
+
+    @classmethod
+    async def _count(cls, **kwargs):
+        """
+        Generic count implementation that is used by the resources.
+        """
+        api = kwargs.pop('api', cls._API)
+        url = kwargs.pop('url')
+        kwargs.update(limit=1, fields='href')
+        response = await api.get(url=url, params=kwargs)
+        return int(response.headers['x-total-matching-query'])
+
+    @classmethod
+    async def get(cls, id, api=None, fields=None):
+        """
+        Fetches the resource from the server.
+        :param id: Resource identifier
+        :param api: sevenbridges AsyncApi instance.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
+        :return: Resource object.
+        """
+        api = api if api else cls._API
+        fields = projection(fields)
+        if 'get' in cls._URL:
+            params = {'fields': ','.join(fields)} if fields else None
+            response = await api.get(
+                url=cls._URL['get'].format(id=id), params=params
+            )
+            return cls._partial(api, response.json(), fields)
+        else:
+            raise SbgError('Unable to fetch resource!')
+
+    async def delete(self):
+        """
+        Deletes the resource on the server.
+        """
+        if 'delete' in self._URL:
+            await self._api.delete(
+                url=self._URL['delete'].format(id=self.id)
+            )
+        else:
+            raise SbgError('Resource can not be deleted!')
+
+    async def reload(self):
+        """
+        Refreshes the resource with the data from the server.
+        """
+        try:
+            await self._data.fetch_async()
+        except Exception:
+            raise SbgError('Resource can not be refreshed!')
+        return self._reload_from(
+            self.__class__(api=self._api, **self._data.data)
+        )
+
+    def _reload_from(self, resource, inplace=True):
+        """
+        Asyncio counterpart of the inplace_reload decorator.
+        """
+        if not inplace:
+            return resource
+        self._data = resource._data
+        self._compound_cache = resource._compound_cache
+        self._dirty = resource._dirty
+        return self
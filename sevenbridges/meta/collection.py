@@ -1,4 +1,10 @@
+import collections
+import itertools
+import threading
+
 import six
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from six.moves import queue, urllib
 
 from sevenbridges.errors import PaginationError
 from sevenbridges.models.link import Link
@@ -13,7 +19,8 @@ class Collection(list):
 
     resource = None
 
-    def __init__(self, resource, href, total, items, links, api):
+    def __init__(self, resource, href, total, items, links, api, raw=False,
+                 fields=None):
         super(Collection, self).__init__(items)
         self.resource = resource
         self.href = href
@@ -21,41 +28,187 @@ class Collection(list):
         self._items = items
         self._total = total
         self._api = api
+        self.raw = raw
+        self.fields = fields
+        self.context = None
 
     @property
     def total(self):
         return int(self._total)
 
-    def all(self):
+    def all(self, parallel=False, max_workers=8, ordered=True, prefetch=0):
         """
         Fetches all available items.
+        :param parallel: If True offsets of all pages are computed from the
+            total number of items and the pages are fetched concurrently,
+            otherwise next links are followed one page at a time.
+        :param max_workers: Max number of pages fetched at once in
+            parallel mode.
+        :param ordered: If False pages are yielded in the order they
+            arrive in parallel mode.
+        :param prefetch: Number of pages following next links read ahead
+            in the background while the current page is processed, ignored
+            in parallel mode.
         :return: Collection object.
         """
+        if parallel:
+            pages = self._pages_parallel(max_workers, ordered)
+        elif prefetch:
+            pages = self._pages_prefetched(prefetch)
+        else:
+            pages = self._pages()
+        for page in pages:
+            for item in page._items:
+                yield item
+
+    def _pages(self):
         page = self._load(self.href)
         while True:
+            yield page
             try:
-                for item in page._items:
-                    yield item
                 page = page.next_page()
             except PaginationError:
-                break
+                return
+
+    def _pages_prefetched(self, depth):
+        pages = queue.Queue(maxsize=depth)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read_ahead():
+            try:
+                for page in self._pages():
+                    if not put((page, None)):
+                        return
+            except Exception as e:
+                put((None, e))
+            else:
+                put((None, None))
+
+        reader = threading.Thread(
+            target=self._api.bind_context(read_ahead),
+            name='collection-read-ahead'
+        )
+        reader.daemon = True
+        reader.start()
+        try:
+            while True:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            stopped.set()
+
+    def _page_urls(self, page):
+        """
+        Computes the urls of the pages following the page loaded from the
+        collection href, using the total number of items.
+        """
+        parts = urllib.parse.urlsplit(self.href)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        params = dict(query)
+        offset = int(params.get('offset') or 0)
+        limit = int(params.get('limit') or len(page._items))
+        if not limit:
+            return
+        query = [(k, v) for k, v in query if k not in ('offset', 'limit')]
+        for offset in range(offset + limit, page.total, limit):
+            yield urllib.parse.urlunsplit(parts._replace(
+                query=urllib.parse.urlencode(
+                    query + [('offset', offset), ('limit', limit)]
+                )
+            ))
+
+    def _pages_parallel(self, max_workers, ordered):
+        page = self._load(self.href)
+        yield page
+        urls = self._page_urls(page)
+        load = self._api.bind_context(self._load)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = collections.deque(
+            executor.submit(load, url)
+            for url in itertools.islice(urls, max_workers)
+        )
+        try:
+            while futures:
+                if ordered:
+                    future = futures.popleft()
+                else:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    futures.remove(future)
+                page = future.result()
+                for url in itertools.islice(urls, 1):
+                    futures.append(executor.submit(load, url))
+                yield page
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def from_response(cls, resource, response, api, raw=False,
+                      fields=None):
+        """
+        Creates the collection from a single page returned by the server.
+        :param resource: Resource class of the collection items.
+        :param response: Response object.
+        :param api: Api instance.
+        :param raw: If True items are the dictionaries decoded from the
+            page json instead of resource objects.
+        :param fields: Field projection the page was requested with.
+        :return: Collection object.
+        """
+        data = response.json()
+        total = response.headers['x-total-matching-query']
+        if raw:
+            items = data['items']
+        else:
+            items = [resource._partial(api, item, fields)
+                     for item in data['items']]
+        links = [Link(**link) for link in data['links']]
+        href = data['href']
+        collection = cls(
+            resource=resource, href=href, total=total, items=items,
+            links=links, api=api, raw=raw, fields=fields
+        )
+        collection.context = getattr(response, 'context', None)
+        return collection
 
     def _load(self, url):
         if self.resource is None:
-            raise NotImplemented('Undefined collection resource.')
+            raise NotImplementedError('Undefined collection resource.')
         else:
-            response = self._api.get(url, append_base=False)
-            data = response.json()
-            total = response.headers['x-total-matching-query']
-            items = [self.resource(api=self._api, **group) for group in
-                     data['items']]
-            links = [Link(**link) for link in data['links']]
-            href = data['href']
-            return Collection(
-                resource=self.resource, href=href, total=total,
-                items=items, links=links, api=self._api
+            response = self._api.get(
+                url, params=self._projection_params(url), append_base=False
+            )
+            return self.from_response(
+                self.resource, response, self._api, raw=self.raw,
+                fields=self.fields
             )
 
+    def _projection_params(self, url):
+        """
+        Adds the field projection to page urls that do not carry it.
+        """
+        if not self.fields:
+            return None
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        if 'fields' in query:
+            return None
+        return {'fields': ','.join(self.fields)}
+
     def next_page(self):
         """
         Fetches next result set.
@@ -1,3 +1,20 @@
+import six
+
+
+def projection(fields):
+    """
+    Normalizes the field projection to a list of field names.
+    :param fields: List of field names or a comma separated string, names
+        prefixed with '!' are excluded.
+    :return: List of field names or None.
+    """
+    if not fields:
+        return None
+    if isinstance(fields, six.string_types):
+        fields = fields.split(',')
+    return [field.strip() for field in fields if field.strip()]
+
+
 class DataContainer(object):
     """
     Utility for fetching data from the API server using,
@@ -9,6 +26,37 @@ class DataContainer(object):
         self._URL = urls
         self.api = api
         self.fetched = False
+        self._included = None
+        self._excluded = None
+
+    def project(self, fields):
+        """
+        Marks the data as a partial representation holding only the
+        projected fields. Fields left out of the projection are not fetched
+        lazily, the resource has to be reloaded to get them.
+        :param fields: List of field names, names prefixed with '!' are
+            excluded.
+        """
+        included, excluded = set(), set()
+        for field in fields:
+            if field == '_all':
+                return
+            if field.startswith('!'):
+                # Excluding a nested field leaves the rest of it in place.
+                if '.' not in field:
+                    excluded.add(field[1:])
+            else:
+                included.add(field.split('.')[0])
+        self._included = included or None
+        self._excluded = excluded or None
+
+    def excluded(self, item):
+        """
+        Checks whether the field was left out by the projection.
+        """
+        if self._included is not None:
+            return item not in self._included
+        return self._excluded is not None and item in self._excluded
 
     def fetch(self):
         href = self.data.get('href', None)
@@ -24,7 +72,7 @@ class DataContainer(object):
         self.fetched = True
 
     def __getitem__(self, item):
-        if item not in self.data:
+        if item not in self.data and not self.excluded(item):
             self.fetch()
         try:
             return self.data[item]
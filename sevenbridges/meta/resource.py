@@ -4,7 +4,8 @@ import six
 
 from sevenbridges.errors import SbgError
 from sevenbridges.http.client import HttpClient
-from sevenbridges.meta.data import DataContainer
+from sevenbridges.http.metrics import url_templates
+from sevenbridges.meta.data import DataContainer, projection
 from sevenbridges.meta.fields import Field, CompoundField, CompoundListField
 
 
@@ -20,8 +21,11 @@ class ResourceMeta(type):
     """
 
     def __new__(cls, name, bases, dct):
-        # Attach fields object fo resource instance.
+        # Attach fields object fo resource instance. Fields declared on
+        # resource base classes are inherited by the subclasses.
         fields = {}
+        for base in reversed(bases):
+            fields.update(getattr(base, '_fields', {}))
         for k, v in dct.items():
             if isinstance(v, Field):
                 if v.name is None:
@@ -31,6 +35,8 @@ class ResourceMeta(type):
                 if v.name is None:
                     v.name = k
         dct['_fields'] = fields
+        if '_URL' in dct:
+            url_templates.register(dct['_URL'].values())
 
         if '__init__' not in dct:
             def init(self, **kwargs):
@@ -39,7 +45,7 @@ class ResourceMeta(type):
                     urls = self._URL
                 except AttributeError:
                     urls = None
-                self._data = DataContainer(urls=urls, api=self._api)
+                self._data = self._data_container(urls=urls, api=self._api)
                 self._dirty = {}
                 self._compound_cache = {}
                 for k, v in kwargs.items():
@@ -78,9 +84,13 @@ class ResourceMeta(type):
                         dirty.update(self._dirty)
                 return dirty
 
-            if '__str__' not in dct:
+            def inherited(attr):
+                return any(attr in vars(klass) for base in bases
+                           for klass in base.__mro__ if klass is not object)
+
+            if '__str__' not in dct and not inherited('__str__'):
                 dct['__str__'] = lambda self: self.__class__.__name__
-            if '__repr__' not in dct:
+            if '__repr__' not in dct and not inherited('__repr__'):
                 if six.PY2:
                     dct['__repr__'] = lambda self: str(self).encode('utf-8')
                 else:
@@ -109,6 +119,7 @@ class Resource(six.with_metaclass(ResourceMeta)):
     query).
     """
     _API = None
+    _data_container = DataContainer
 
     def __init__(self, api):
         self.api = api
@@ -117,37 +128,65 @@ class Resource(six.with_metaclass(ResourceMeta)):
     def _query(cls, **kwargs):
         """
         Generic query implementation that is used
-        by the resources.
+        by the resources. With raw=True the collection items are plain
+        dictionaries decoded from the page json, with fields set only the
+        projected fields are requested.
         """
-        from sevenbridges.models.link import Link
         from sevenbridges.meta.collection import Collection
 
         #: :type: _HttpClient
         api = kwargs.pop('api', cls._API)
         url = kwargs.pop('url')
+        raw = kwargs.pop('raw', False)
+        fields = projection(kwargs.pop('fields', None))
+        if fields:
+            kwargs['fields'] = ','.join(fields)
+        response = api.get(url=url, params=kwargs)
+        return Collection.from_response(cls, response, api, raw=raw,
+                                        fields=fields)
+
+    @classmethod
+    def _count(cls, **kwargs):
+        """
+        Generic count implementation that is used by the resources. A single
+        item is requested, only to read the number of matching items.
+        """
+        api = kwargs.pop('api', cls._API)
+        url = kwargs.pop('url')
+        kwargs.update(limit=1, fields='href')
         response = api.get(url=url, params=kwargs)
-        data = response.json()
-        total = response.headers['x-total-matching-query']
-        projects = [cls(api=api, **project) for project in data['items']]
-        links = [Link(**link) for link in data['links']]
-        href = data['href']
-        return Collection(
-            resource=cls, href=href, total=total, items=projects,
-            links=links, api=api
-        )
+        return int(response.headers['x-total-matching-query'])
+
+    @classmethod
+    def _partial(cls, api, data, fields):
+        """
+        Creates the resource, if fields are given its data holds only
+        the projected fields.
+        """
+        resource = cls(api=api, **data)
+        if fields:
+            resource._data.project(fields)
+        return resource
 
     @classmethod
-    def get(cls, id, api=None):
+    def get(cls, id, api=None, fields=None):
         """
         Fetches the resource from the server.
         :param id: Resource identifier
         :param api: sevenbridges Api instance.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded. Other fields of the partial resource are not fetched
+            lazily.
         :return: Resource object.
         """
         api = api if api else cls._API
+        fields = projection(fields)
         if 'get' in cls._URL:
-            resource = api.get(url=cls._URL['get'].format(id=id)).json()
-            return cls(api=api, **resource)
+            params = {'fields': ','.join(fields)} if fields else None
+            resource = api.get(
+                url=cls._URL['get'].format(id=id), params=params
+            ).json()
+            return cls._partial(api, resource, fields)
         else:
             raise SbgError('Unable to fetch resource!')
 
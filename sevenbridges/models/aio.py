@@ -0,0 +1,452 @@
+"""
+Asyncio counterparts of the central resources. Query methods inherited from
+the synchronous resources return awaitables, all other network bound methods
+are overridden with coroutines. Requires Python 3.6+.
+"""
+import asyncio
+
+from sevenbridges.errors import SbgError
+from sevenbridges.meta.aio import AsyncResource, AsyncCollection
+from sevenbridges.meta.transformer import Transform
+from sevenbridges.models.app import App
+from sevenbridges.models.billing_breakdown import BillingGroupBreakdown
+from sevenbridges.models.billing_group import BillingGroup
+from sevenbridges.models.compound.download_info import DownloadInfo
+from sevenbridges.models.endpoints import Endpoints
+from sevenbridges.models.execution_details import ExecutionDetails
+from sevenbridges.models.file import File
+from sevenbridges.models.invoice import Invoice
+from sevenbridges.models.member import Member
+from sevenbridges.models.project import Project
+from sevenbridges.models.rate_limit import RateLimit
+from sevenbridges.models.task import Task
+from sevenbridges.models.user import User
+
+
+class AsyncUser(User, AsyncResource):
+    """
+    Asyncio resource for managing users.
+    """
+
+    @classmethod
+    async def me(cls, api=None):
+        """
+        Retrieves current user information.
+        :param api: AsyncApi instance.
+        :return: AsyncUser object.
+        """
+        api = api if api else cls._API
+        response = await api.get(cls._URL['me'])
+        return cls(api=api, **response.json())
+
+
+class AsyncEndpoints(Endpoints, AsyncResource):
+    """
+    Asyncio resource for managing Endpoints.
+    """
+
+    @classmethod
+    async def get(cls, api=None, **kwargs):
+        """
+        Get api links.
+        :param api: AsyncApi instance.
+        :return: AsyncEndpoints object.
+        """
+        api = api if api else cls._API
+        response = await api.get(url=cls._URL['get'])
+        return cls(api=api, **response.json())
+
+
+class AsyncRateLimit(RateLimit, AsyncResource):
+    """
+    Asyncio resource for the rate limit information.
+    """
+
+    @classmethod
+    async def get(cls, id=None, api=None):
+        """
+        Get the rate limit information.
+        :param api: AsyncApi instance.
+        :return: AsyncRateLimit object.
+        """
+        api = api if api else cls._API
+        response = await api.get(url=cls._URL['get'])
+        return cls(api=api, **response.json())
+
+
+class AsyncBillingGroupBreakdown(BillingGroupBreakdown, AsyncResource):
+    """
+    Asyncio resource for managing billing group breakdowns.
+    """
+
+
+class AsyncBillingGroup(BillingGroup, AsyncResource):
+    """
+    Asyncio resource for managing billing groups.
+    """
+
+    async def breakdown(self):
+        """
+        Get Billing group breakdown for the current billing group.
+        """
+        return await AsyncBillingGroupBreakdown.get(self.id, self._api)
+
+
+class AsyncInvoice(Invoice, AsyncResource):
+    """
+    Asyncio resource for managing invoices.
+    """
+
+
+class AsyncApp(App, AsyncResource):
+    """
+    Asyncio resource for managing apps.
+    """
+
+    @classmethod
+    async def get_revision(cls, id, revision, api=None):
+        """
+        Get app revision.
+        :param id: App identifier.
+        :param revision: App revision
+        :param api: AsyncApi instance.
+        :return: AsyncApp object.
+        """
+        api = api if api else cls._API
+        response = await api.get(url=cls._URL['get_revision'].format(
+            id=id, revision=revision))
+        return cls(api=api, **response.json())
+
+    @classmethod
+    async def install_app(cls, id, raw, api=None):
+        """
+        Installs and app.
+        :param id:  App identifier.
+        :param raw: Raw cwl data.
+        :param api: AsyncApi instance.
+        :return: AsyncApp object.
+        """
+        api = api if api else cls._API
+        response = await api.post(url=cls._URL['raw'].format(id=id),
+                                  data=raw)
+        response = await api.get(url=cls._URL['get'].format(
+            id=response.json()['sbg:id']))
+        return cls(api=api, **response.json())
+
+    @classmethod
+    async def create_revision(cls, id, revision, raw, api=None):
+        """
+        Create a new app revision.
+        :param id:  App identifier.
+        :param revision: App revision.
+        :param raw: Raw cwl object.
+        :param api: AsyncApi instance.
+        :return: AsyncApp object.
+        """
+        id = id.rsplit('/', 1)[0]
+        api = api if api else cls._API
+        response = await api.post(url=cls._URL['create_revision'].format(
+            id=id, revision=revision), data=raw)
+        response = await api.get(url=cls._URL['get'].format(
+            id=response.json()['sbg:id']))
+        return cls(api=api, **response.json())
+
+    async def copy(self, project, name=None):
+        """
+        Copies the current app.
+        :param project: Destination project.
+        :param name: Destination app name.
+        :return: Copied AsyncApp object.
+        """
+        project = Transform.to_project(project)
+        data = {
+            'project': project
+        }
+        if name:
+            data['name'] = name
+
+        response = await self._api.post(
+            url=self._URL['copy'].format(id=self.id), data=data)
+        return self.__class__(api=self._api, **response.json())
+
+
+class AsyncFile(File, AsyncResource):
+    """
+    Asyncio resource for managing files.
+    """
+
+    async def copy(self, project, name=None):
+        """
+        Copies the current file.
+        :param project: Destination project.
+        :param name: Destination file name.
+        :return: Copied AsyncFile object.
+        """
+        project = Transform.to_project(project)
+        data = {
+            'project': project
+        }
+        if name:
+            data['name'] = name
+        response = await self._api.post(
+            url=self._URL['copy'].format(id=self.id), data=data)
+        return self.__class__(api=self._api, **response.json())
+
+    async def download_info(self):
+        """
+        Fetches download information containing file url
+        that can be used to download file.
+        :return: Download info object.
+        """
+        response = await self._api.get(
+            url=self._URL['download_info'].format(id=self.id))
+        return DownloadInfo(api=self._api, **response.json())
+
+    def download(self, *args, **kwargs):
+        raise SbgError('Downloads are not supported by the asyncio client, '
+                       'use the stream method instead.')
+
+    async def save(self, inplace=True):
+        """
+        Saves all modification to the file on the server.
+        :param inplace Apply edits to the current instance or get a new one.
+        :return: AsyncFile instance.
+        """
+        modified_data = self._modified_data()
+        if not bool(modified_data):
+            return self
+        if 'metadata' in modified_data:
+            await self._api.patch(
+                url=self._URL['metadata'].format(id=self.id),
+                data=modified_data['metadata'])
+            self.metadata._dirty = {}
+            return self._reload_from(
+                await self.get(id=self.id, api=self._api), inplace
+            )
+        response = await self._api.patch(
+            url=self._URL['get'].format(id=self.id), data=modified_data)
+        return self._reload_from(
+            self.__class__(api=self._api, **response.json()), inplace
+        )
+
+    async def stream(self, part_size=None):
+        """
+        Creates an async iterator which can be used to stream the file
+        content.
+        :param part_size: Size of the part in bytes.
+        :return Async iterator
+        """
+        download_info = await self.download_info()
+        response = await self._api.get(
+            url=download_info.url, stream=True, append_base=False
+        )
+        try:
+            async for part in response.aiter_bytes(part_size):
+                yield part
+        finally:
+            await response.aclose()
+
+
+class AsyncTask(Task, AsyncResource):
+    """
+    Asyncio resource for managing tasks.
+    """
+
+    @classmethod
+    async def create(cls, name, project, app, batch_input=None,
+                     batch_by=None, inputs=None, description=None, run=False,
+                     api=None):
+        """
+        Creates a task on server.
+        :param name: Task name.
+        :param project: Project identifier.
+        :param app: CWL app identifier.
+        :param batch_input: Batch input.
+        :param batch_by: Batch criteria.
+        :param inputs: Input map.
+        :param description: Task description.
+        :param run: True if you want to run a task upon creation.
+        :param api: AsyncApi instance.
+        :return: AsyncTask object.
+        """
+        task_data = cls._create_data(name, project, app, batch_input,
+                                     batch_by, inputs, description)
+        params = {'action': 'run'} if run else {}
+        api = api if api else cls._API
+        response = await api.post(cls._URL['query'], data=task_data,
+                                  params=params)
+        return cls(api=api, **response.json())
+
+    async def abort(self, inplace=True):
+        """
+        Abort task
+        :param inplace Apply action on the current object or return a new one.
+        :return: AsyncTask object.
+        """
+        response = await self._api.post(
+            url=self._URL['abort'].format(id=self.id))
+        return self._reload_from(
+            self.__class__(api=self._api, **response.json()), inplace
+        )
+
+    async def run(self, batch=True, inplace=True):
+        """
+        Run task
+        :param batch if False batching will be disabled.
+        :param inplace Apply action on the current object or return a new one.
+        :return: AsyncTask object.
+        """
+        params = {}
+        if not batch:
+            params['batch'] = False
+        response = await self._api.post(
+            url=self._URL['run'].format(id=self.id), params=params)
+        return self._reload_from(
+            self.__class__(api=self._api, **response.json()), inplace
+        )
+
+    async def save(self, inplace=True):
+        """
+        Saves all modification to the task on the server.
+        :param inplace Apply edits on the current instance or get a new one.
+        :return: AsyncTask instance.
+        """
+        modified_data = self._modified_data()
+        if not bool(modified_data):
+            return self
+        response = await self._api.patch(
+            url=self._URL['get'].format(id=self.id),
+            data=self._save_data(modified_data))
+        return self._reload_from(
+            self.__class__(api=self._api, **response.json()), inplace
+        )
+
+    async def get_execution_details(self):
+        """
+        Retrieves execution details for a task.
+        :return: Execution details instance.
+        """
+        response = await self._api.get(
+            self._URL['execution_details'].format(id=self.id))
+        return ExecutionDetails(api=self._api, **response.json())
+
+
+class AsyncProject(Project, AsyncResource):
+    """
+    Asyncio resource for managing projects.
+    """
+
+    @classmethod
+    async def create(cls, name, billing_group, description=None, tags=None,
+                     api=None):
+        """
+        Create a project.
+        :param name:  Project name.
+        :param billing_group: Project billing group.
+        :param description:  Project description.
+        :param tags: Project tags.
+        :param api: AsyncApi instance.
+        :return: AsyncProject object.
+        """
+        api = api if api else cls._API
+        data = cls._create_data(name, billing_group, description, tags)
+        response = await api.post(url=cls._URL['query'], data=data)
+        return cls(api=api, **response.json())
+
+    async def save(self, inplace=True):
+        """
+        Saves all modification to the project on the server.
+        :param inplace Apply edits on the current instance or get a new one.
+        :return: AsyncProject instance.
+        """
+        if not bool(self._modified_data()):
+            return self
+        response = await self._api.patch(
+            url=self._URL['get'].format(id=self.id),
+            data=self._modified_data())
+        return self._reload_from(
+            self.__class__(api=self._api, **response.json()), inplace
+        )
+
+    async def get_members(self, offset=None, limit=None):
+        """
+        Retrieves project members.
+        :param offset: Pagination offset.
+        :param limit: Pagination limit.
+        :return: AsyncCollection object.
+        """
+        response = await self._api.get(
+            url=self._URL['members_query'].format(id=self.id),
+            params={'offset': offset, 'limit': limit})
+        return AsyncCollection.from_response(Member, response, self._api)
+
+    async def add_member(self, user, permissions):
+        """
+        Add a member to the project.
+        :param user:  Member username
+        :param permissions: Permissions dictionary.
+        :return: Member object.
+        """
+        user = Transform.to_user(user)
+        data = {}
+        if isinstance(permissions, dict):
+            data = {
+                'username': user,
+                'permissions': permissions
+            }
+        response = await self._api.post(
+            url=self._URL['members_query'].format(id=self.id), data=data)
+        return Member(api=self._api, **response.json())
+
+    async def remove_member(self, user):
+        """
+        Remove member from the project.
+        :param user: User to be removed.
+        """
+        member = Transform.to_user(user)
+        await self._api.delete(url=self._URL['members_get'].format(
+            id=self.id,
+            member=member))
+
+    async def add_files(self, files):
+        """
+        Adds files to this project. Files are copied concurrently.
+        :param files: List of AsyncFile objects.
+        """
+        results = await asyncio.gather(
+            *[file.copy(project=self.id) for file in files],
+            return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+
+    def get_files(self, offset=None, limit=None):
+        """
+        Retrieves files in this project.
+        :param offset: Pagination offset.
+        :param limit: Pagination limit.
+        :return: Awaitable returning AsyncCollection object.
+        """
+        return AsyncFile.query(project=self.id, offset=offset, limit=limit,
+                               api=self._api)
+
+    def get_tasks(self, offset=None, limit=None):
+        """
+        Retrieves tasks in this project.
+        :param offset:  Pagination offset.
+        :param limit: Pagination limit.
+        :return: Awaitable returning AsyncCollection object.
+        """
+        return AsyncTask.query(project=self.id, offset=offset, limit=limit,
+                               api=self._api)
+
+    def get_apps(self, offset=None, limit=None):
+        """
+        Retrieves apps in this project.
+        :param offset:  Pagination offset.
+        :param limit: Pagination limit.
+        :return: Awaitable returning AsyncCollection object.
+        """
+        return AsyncApp.query(project=self.id, offset=offset, limit=limit,
+                              api=self._api)
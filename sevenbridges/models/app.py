@@ -1,7 +1,9 @@
+from datetime import datetime
+
 import six
 
 from sevenbridges.meta.resource import Resource
-from sevenbridges.errors import SbgError
+from sevenbridges.errors import SbgError, NotFound
 from sevenbridges.meta.transformer import Transform
 from sevenbridges.meta.fields import (
     HrefField, StringField, IntegerField, DictField
@@ -32,13 +34,17 @@ class App(Resource):
 
     @classmethod
     def query(cls, project=None, visibility=None, offset=None, limit=None,
-              api=None):
+              api=None, raw=False, fields=None):
         """
         Query (List) apps.
         :param visibility:
         :param project:
         :param offset: Pagination offset.
         :param limit: Pagination limit.
+        :param raw: If True items are plain dictionaries instead of
+            app objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         :param api: Api instance.
         :return: collection object
         """
@@ -47,7 +53,23 @@ class App(Resource):
         api = api or cls._API
         return super(App, cls)._query(url=cls._URL['query'], project=project,
                                       visibility=visibility,
-                                      offset=offset, limit=limit, api=api)
+                                      offset=offset, limit=limit, api=api,
+                                      raw=raw, fields=fields)
+
+    @classmethod
+    def count(cls, project=None, visibility=None, api=None):
+        """
+        Counts the apps matching the query without fetching them.
+        :param project: Project id.
+        :param visibility: App visibility.
+        :param api: Api instance.
+        :return: Number of matching apps.
+        """
+        if project:
+            project = Transform.to_project(project)
+        api = api or cls._API
+        return super(App, cls)._count(url=cls._URL['query'], project=project,
+                                      visibility=visibility, api=api)
 
     @classmethod
     def get_revision(cls, id, revision, api=None):
@@ -101,11 +123,13 @@ class App(Resource):
             url=cls._URL['get'].format(id=app['sbg:id'])).json()
         return App(api=api, **app_wrapper)
 
-    def copy(self, project, name=None):
+    def copy(self, project, name=None, idempotency_key=None):
         """
         Copies the current app.
         :param project: Destination project.
         :param name: Destination app name.
+        :param idempotency_key: Key identifying the operation when it is
+            retried, e.g. after a restart of the job.
         :return: Copied App object.
         """
 
@@ -116,6 +140,22 @@ class App(Resource):
         if name:
             data['name'] = name
 
-        app = self._api.post(url=self._URL['copy'].format(id=self.id),
-                             data=data).json()
-        return App(api=self._api, **app)
+        def send(headers):
+            app = self._api.post(url=self._URL['copy'].format(id=self.id),
+                                 headers=headers, data=data).json()
+            return App(api=self._api, **app)
+
+        def reconcile(since):
+            app_name = name or self.id.split('/')[2]
+            try:
+                app = App.get(id='{}/{}'.format(project, app_name),
+                              api=self._api)
+            except NotFound:
+                return
+            # Copy creates a new revision of an existing app.
+            modified = (app.raw or {}).get('sbg:modifiedOn')
+            if modified and datetime.utcfromtimestamp(modified) >= since:
+                yield app
+
+        return self._api.idempotent(App, send, reconcile,
+                                    key=idempotency_key)
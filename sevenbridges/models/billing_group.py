@@ -29,17 +29,33 @@ class BillingGroup(Resource):
         return six.text_type('<BillingGroup: id={id}>'.format(id=self.id))
 
     @classmethod
-    def query(cls, offset=None, limit=None, api=None):
+    def query(cls, offset=None, limit=None, api=None, raw=False,
+              fields=None):
         """
         Query (List) billing group.
         :param offset: Pagination offset.
         :param limit: Pagination limit.
         :return: Collection object.
         :param api: Api instance.
+        :param raw: If True items are plain dictionaries instead of
+            billing group objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         """
         api = api or cls._API
         return super(BillingGroup, cls)._query(
-            url=cls._URL['query'], offset=offset, limit=limit, api=api)
+            url=cls._URL['query'], offset=offset, limit=limit, api=api,
+            raw=raw, fields=fields)
+
+    @classmethod
+    def count(cls, api=None):
+        """
+        Counts the billing groups without fetching them.
+        :param api: Api instance.
+        :return: Number of billing groups.
+        """
+        api = api or cls._API
+        return super(BillingGroup, cls)._count(url=cls._URL['query'], api=api)
 
     def breakdown(self):
         """
@@ -0,0 +1,21 @@
+import six
+
+from sevenbridges.meta.resource import Resource
+from sevenbridges.meta.fields import IntegerField
+
+
+class Rate(Resource):
+    """
+    Rate resource contains the request limit, the number of remaining
+    requests and the reset time (in epoch seconds) of the rate limit window.
+    """
+    limit = IntegerField(read_only=True)
+    remaining = IntegerField(read_only=True)
+    reset = IntegerField(read_only=True)
+
+    def __str__(self):
+        return six.text_type(
+            '<Rate: limit={limit}, remaining={remaining}, reset={reset}>'
+            .format(limit=self.limit, remaining=self.remaining,
+                    reset=self.reset)
+        )
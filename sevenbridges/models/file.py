@@ -41,7 +41,8 @@ class File(Resource):
 
     @classmethod
     def query(cls, project, names=None, metadata=None, origin=None,
-              offset=None, limit=None, api=None):
+              offset=None, limit=None, api=None, raw=False,
+              fields=None):
         """
         Query ( List ) projects
         :param project: Project id
@@ -50,12 +51,43 @@ class File(Resource):
         :param origin: Origin query dict
         :param offset: Pagination offset
         :param limit: Pagination limit
+        :param raw: If True items are plain dictionaries instead of
+            file objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         :param api: Api instance.
         :return: Collection object.
         """
         api = api or cls._API
 
         project = Transform.to_project(project)
+        query_params = cls._filters(names, metadata, origin)
+
+        return super(File, cls)._query(api=api, url=cls._URL['query'],
+                                       project=project, offset=offset,
+                                       limit=limit, raw=raw, fields=fields,
+                                       **query_params)
+
+    @classmethod
+    def count(cls, project, names=None, metadata=None, origin=None,
+              api=None):
+        """
+        Counts the files matching the query without fetching them.
+        :param project: Project id
+        :param names: Name list
+        :param metadata: Metadata query dict
+        :param origin: Origin query dict
+        :param api: Api instance.
+        :return: Number of matching files.
+        """
+        api = api or cls._API
+        project = Transform.to_project(project)
+        return super(File, cls)._count(api=api, url=cls._URL['query'],
+                                       project=project,
+                                       **cls._filters(names, metadata, origin))
+
+    @staticmethod
+    def _filters(names=None, metadata=None, origin=None):
         query_params = {}
 
         if names and isinstance(names, list):
@@ -74,16 +106,15 @@ class File(Resource):
                 origin_params['origin.' + k] = origin[k]
 
         query_params.update(origin_params)
+        return query_params
 
-        return super(File, cls)._query(api=api, url=cls._URL['query'],
-                                       project=project, offset=offset,
-                                       limit=limit, **query_params)
-
-    def copy(self, project, name=None):
+    def copy(self, project, name=None, idempotency_key=None):
         """
         Copies the current file.
         :param project: Destination project.
         :param name: Destination file name.
+        :param idempotency_key: Key identifying the operation when it is
+            retried, e.g. after a restart of the job.
         :return: Copied File object.
         """
         project = Transform.to_project(project)
@@ -92,9 +123,23 @@ class File(Resource):
         }
         if name:
             data['name'] = name
-        new_file = self._api.post(url=self._URL['copy'].format(id=self.id),
-                                  data=data).json()
-        return File(api=self._api, **new_file)
+
+        def send(headers):
+            new_file = self._api.post(
+                url=self._URL['copy'].format(id=self.id), headers=headers,
+                data=data).json()
+            return File(api=self._api, **new_file)
+
+        def reconcile(since):
+            files = File.query(project=project, names=[name or self.name],
+                               api=self._api)
+            for file in files:
+                created = file.created_on
+                if file.id != self.id and created and created >= since:
+                    yield file
+
+        return self._api.idempotent(File, send, reconcile,
+                                    key=idempotency_key)
 
     def download_info(self):
         """
@@ -106,7 +151,7 @@ class File(Resource):
         return DownloadInfo(api=self._api, **info.json())
 
     def download(self, path, retry=5, timeout=10, chunk_size=67108864,
-                 wait=True):
+                 wait=True, deadline=None):
         """
         Downloads the file and returns a download handle.
         Download will not start until .start() method is invoked.
@@ -115,12 +160,14 @@ class File(Resource):
         :param timeout:  Timeout for http requests.
         :param chunk_size:  Chunk size in bytes.
         :param wait: If true will wait for download to complete.
+        :param deadline: Time budget of the whole download in seconds.
         :return: Download handle.
         """
         info = self.download_info()
         download = Download(url=info.url, file_path=path, retry=retry,
                             timeout=timeout,
-                            chunk_size=chunk_size, api=self._api)
+                            chunk_size=chunk_size, api=self._api,
+                            deadline=deadline)
         if wait:
             download.start()
             download.wait()
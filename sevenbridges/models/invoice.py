@@ -28,14 +28,30 @@ class Invoice(Resource):
         return six.text_type('<Invoice: id={id}>'.format(id=self.id))
 
     @classmethod
-    def query(cls, offset=None, limit=None, api=None):
+    def query(cls, offset=None, limit=None, api=None, raw=False,
+              fields=None):
         """
         Query (List) invoices.
         :param offset: Pagination offset.
         :param limit: Pagination limit.
+        :param raw: If True items are plain dictionaries instead of
+            invoice objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         :param api: Api instance.
         :return: Collection object.
         """
         api = api if api else cls._API
         return super(Invoice, cls)._query(
-            url=cls._URL['query'], offset=offset, limit=limit, api=api)
+            url=cls._URL['query'], offset=offset, limit=limit, api=api,
+            raw=raw, fields=fields)
+
+    @classmethod
+    def count(cls, api=None):
+        """
+        Counts the invoices without fetching them.
+        :param api: Api instance.
+        :return: Number of invoices.
+        """
+        api = api or cls._API
+        return super(Invoice, cls)._count(url=cls._URL['query'], api=api)
@@ -1,4 +1,5 @@
 import six
+from concurrent.futures import FIRST_EXCEPTION, wait
 
 from sevenbridges.meta.resource import Resource
 from sevenbridges.meta.transformer import Transform
@@ -41,17 +42,33 @@ class Project(Resource):
         return six.text_type('<Project: id={id}>'.format(id=self.id))
 
     @classmethod
-    def query(cls, offset=None, limit=None, api=None):
+    def query(cls, offset=None, limit=None, api=None, raw=False,
+              fields=None):
         """
         Query (List) projects
         :param offset: Pagination offset.
         :param limit: Pagination limit.
+        :param raw: If True items are plain dictionaries instead of
+            project objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         :param api: Api instance.
         :return: Collection object.
         """
         api = api if api else cls._API
         return super(Project, cls)._query(url=cls._URL['query'], offset=offset,
-                                          limit=limit, api=api)
+                                          limit=limit, api=api, raw=raw,
+                                          fields=fields)
+
+    @classmethod
+    def count(cls, api=None):
+        """
+        Counts the projects without fetching them.
+        :param api: Api instance.
+        :return: Number of projects.
+        """
+        api = api or cls._API
+        return super(Project, cls)._count(url=cls._URL['query'], api=api)
 
     @classmethod
     def create(cls, name, billing_group, description=None, tags=None,
@@ -66,7 +83,16 @@ class Project(Resource):
         :return:
         """
         api = api if api else cls._API
+        data = cls._create_data(name, billing_group, description, tags)
+        project_data = api.post(url=cls._URL['query'],
+                                data=data).json()
+        return Project(api=api, **project_data)
 
+    @staticmethod
+    def _create_data(name, billing_group, description, tags):
+        """
+        Serializes the project creation request body.
+        """
         billing_group = Transform.to_billing_group(billing_group)
         if name is None:
             raise SbgError('Project name is required!')
@@ -79,10 +105,7 @@ class Project(Resource):
             data['description'] = description
         if tags:
             data['tags'] = tags
-
-        project_data = api.post(url=cls._URL['query'],
-                                data=data).json()
-        return Project(api=api, **project_data)
+        return data
 
     @inplace_reload
     def save(self, inplace=True):
@@ -115,11 +138,13 @@ class Project(Resource):
         return Collection(resource=Member, href=href, total=total,
                           items=members, links=links, api=self._api)
 
-    def add_member(self, user, permissions):
+    def add_member(self, user, permissions, idempotency_key=None):
         """
         Add a member to the project.
         :param user:  Member username
         :param permissions: Permissions dictionary.
+        :param idempotency_key: Key identifying the operation when it is
+            retried, e.g. after a restart of the job.
         :return: Member object.
         """
         user = Transform.to_user(user)
@@ -129,10 +154,26 @@ class Project(Resource):
                 'username': user,
                 'permissions': permissions
             }
-        response = self._api.post(
-            url=self._URL['members_query'].format(id=self.id), data=data)
-        member_data = response.json()
-        return Member(api=self._api, **member_data)
+
+        def send(headers):
+            response = self._api.post(
+                url=self._URL['members_query'].format(id=self.id),
+                headers=headers, data=data)
+            member_data = response.json()
+            return Member(api=self._api, **member_data)
+
+        def reconcile(since):
+            # Membership carries no creation time, a member is accepted
+            # only if it has exactly the requested permissions.
+            for member in self.get_members().all():
+                if member.username == user and member.permissions and all(
+                        getattr(member.permissions, permission) == value
+                        for permission, value in data.get(
+                            'permissions', {}).items()):
+                    yield member
+
+        return self._api.idempotent(Member, send, reconcile,
+                                    key=idempotency_key)
 
     def get_files(self, offset=None, limit=None):
         """
@@ -154,11 +195,23 @@ class Project(Resource):
 
     def add_files(self, files):
         """
-        Adds files to this project.
+        Adds files to this project. Files are copied concurrently within
+        the adaptive concurrency limit of bulk operations and the deadline
+        and priority of the caller. Copies not started yet are cancelled
+        on the first error.
         :param files: List of files or a Collection object.
         """
-        for file in files:
-            file.copy(project=self.id)
+        copy = self._api.bind_context(self._api.bulk_concurrency.run)
+        futures = [
+            self._api.upload_pool.submit(copy, file.copy, project=self.id)
+            for file in files
+        ]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+        errors = [f.exception() for f in done if f.exception()]
+        if errors:
+            raise errors[0]
 
     def get_apps(self, offset=None, limit=None):
         """
@@ -0,0 +1,32 @@
+import six
+
+from sevenbridges.meta.resource import Resource
+from sevenbridges.meta.fields import CompoundField
+from sevenbridges.models.compound.rate import Rate
+
+
+class RateLimit(Resource):
+    """
+    Rate limit resource contains the current state of the rate limit
+    for the authenticated user.
+    """
+    _URL = {
+        'get': '/rate_limit'
+    }
+
+    rate = CompoundField(Rate, read_only=True)
+    instance_limit = CompoundField(Rate, read_only=True)
+
+    def __str__(self):
+        return six.text_type('<RateLimit: rate={rate}>'.format(rate=self.rate))
+
+    @classmethod
+    def get(cls, id=None, api=None):
+        """
+        Get the rate limit information.
+        :param api: Api instance.
+        :return: RateLimit object.
+        """
+        api = api if api else cls._API
+        rate_limit = api.get(url=cls._URL['get']).json()
+        return RateLimit(api=api, **rate_limit)
@@ -40,6 +40,7 @@ class Task(Resource):
     app = StringField()
     type = StringField(read_only=True)
     created_by = StringField(read_only=True)
+    created_time = DateTimeField(read_only=True)
     executed_by = StringField(read_only=True)
     start_time = DateTimeField(read_only=True)
     batch = BooleanField(read_only=True)
@@ -58,7 +59,8 @@ class Task(Resource):
 
     @classmethod
     def query(cls, project=None, status=None, batch=None,
-              parent=None, offset=None, limit=None, api=None):
+              parent=None, offset=None, limit=None, api=None, raw=False,
+              fields=None):
         """
         Query (List) tasks
         :param project: Target project. optional.
@@ -67,6 +69,10 @@ class Task(Resource):
         :param parent: Parent batch task identifier.
         :param offset: Pagination offset.
         :param limit: Pagination limit.
+        :param raw: If True items are plain dictionaries instead of
+            task objects.
+        :param fields: Fields to fetch, names prefixed with '!' are
+            excluded.
         :param api: Api instance.
         :return: Collection object.
         """
@@ -76,12 +82,32 @@ class Task(Resource):
         return super(Task, cls)._query(url=cls._URL['query'], project=project,
                                        status=status, batch=batch,
                                        parent=parent, offset=offset,
-                                       limit=limit, api=api)
+                                       limit=limit, api=api, raw=raw,
+                                       fields=fields)
+
+    @classmethod
+    def count(cls, project=None, status=None, batch=None, parent=None,
+              api=None):
+        """
+        Counts the tasks matching the query without fetching them.
+        :param project: Target project. optional.
+        :param status: Task status.
+        :param batch: Only batch tasks.
+        :param parent: Parent batch task identifier.
+        :param api: Api instance.
+        :return: Number of matching tasks.
+        """
+        api = api or cls._API
+        if parent:
+            parent = Transform.to_task(parent)
+        return super(Task, cls)._count(url=cls._URL['query'], project=project,
+                                       status=status, batch=batch,
+                                       parent=parent, api=api)
 
     @classmethod
     def create(cls, name, project, app, batch_input=None, batch_by=None,
                inputs=None,
-               description=None, run=False, api=None):
+               description=None, run=False, api=None, idempotency_key=None):
 
         """
         Creates a task on server.
@@ -94,8 +120,56 @@ class Task(Resource):
         :param description: Task description.
         :param run: True if you want to run a task upon creation.
         :param api: Api instance.
+        :param idempotency_key: Key identifying the operation when it is
+            retried, e.g. after a restart of the job.
         :return: Task object.
         """
+        task_data = cls._create_data(name, project, app, batch_input,
+                                     batch_by, inputs, description)
+        params = {'action': 'run'} if run else {}
+        api = api if api else cls._API
+        sent = []
+
+        def send(headers):
+            created_task = api.post(cls._URL['query'], headers=headers,
+                                    data=task_data, params=params).json()
+            sent.append(True)
+            return Task(api=api, **created_task)
+
+        has_revision = task_data['app'].count('/') > 2
+
+        def reconcile(since):
+            # Newest tasks of the project created since the first attempt,
+            # a task created by it is on the first page.
+            tasks = cls._query(
+                url=cls._URL['query'], project=task_data['project'],
+                status=None if run else 'DRAFT',
+                created_from=since.strftime('%Y-%m-%dT%H:%M:%S'),
+                order_by='created_time', order='desc', api=api
+            )
+            for task in tasks:
+                if task.name != name or not task.app:
+                    continue
+                # Server returns the app id with the revision appended.
+                app_id = task.app
+                if not has_revision:
+                    app_id = app_id.rsplit('/', 1)[0]
+                created = task.created_time
+                if app_id == task_data['app'] and created and created >= since:
+                    yield task
+
+        task = api.idempotent(Task, send, reconcile, key=idempotency_key)
+        if run and not sent and task.status == 'DRAFT':
+            # Task found by reconciliation was not started yet.
+            task = task.run()
+        return task
+
+    @staticmethod
+    def _create_data(name, project, app, batch_input, batch_by, inputs,
+                     description):
+        """
+        Serializes the task creation request body.
+        """
         task_data = {}
 
         project = Transform.to_project(project)
@@ -141,12 +215,7 @@ class Task(Resource):
         }
         task_data.update(task_meta)
         task_data.update(task_inputs)
-
-        params = {'action': 'run'} if run else {}
-        api = api if api else cls._API
-        created_task = api.post(cls._URL['query'], data=task_data,
-                                params=params).json()
-        return Task(api=api, **created_task)
+        return task_data
 
     @inplace_reload
     def abort(self, inplace=True):
@@ -183,30 +252,34 @@ class Task(Resource):
         """
         modified_data = self._modified_data()
         if bool(modified_data):
-            task_request_data = {}
-            inputs = modified_data.pop('inputs')
-            task_request_data.update(modified_data)
-            if inputs:
-                task_request_data['inputs'] = {}
-                for input_id, input_value in inputs.items():
-                    if isinstance(input_value, File):
-                        in_file = Task._to_api_file_format(input_value)
-                        task_request_data['inputs'][input_id] = in_file
-                    elif isinstance(input_value, list):
-                        in_list = [item for item in input_value if
-                                   not isinstance(item, File)]
-                        in_list.extend([Task._to_api_file_format(item)
-                                        for item in input_value if
-                                        isinstance(item, File)])
-
-                        task_request_data['inputs'][input_id] = in_list
-                    else:
-                        task_request_data['inputs'][input_id] = input_value
             data = self._api.patch(url=self._URL['get'].format(id=self.id),
-                                   data=task_request_data).json()
+                                   data=self._save_data(modified_data)).json()
             task = Task(api=self._api, **data)
             return task
 
+    @staticmethod
+    def _save_data(modified_data):
+        task_request_data = {}
+        inputs = modified_data.pop('inputs')
+        task_request_data.update(modified_data)
+        if inputs:
+            task_request_data['inputs'] = {}
+            for input_id, input_value in inputs.items():
+                if isinstance(input_value, File):
+                    in_file = Task._to_api_file_format(input_value)
+                    task_request_data['inputs'][input_id] = in_file
+                elif isinstance(input_value, list):
+                    in_list = [item for item in input_value if
+                               not isinstance(item, File)]
+                    in_list.extend([Task._to_api_file_format(item)
+                                    for item in input_value if
+                                    isinstance(item, File)])
+
+                    task_request_data['inputs'][input_id] = in_list
+                else:
+                    task_request_data['inputs'][input_id] = input_value
+        return task_request_data
+
     @staticmethod
     def _to_api_file_format(_file):
         api_file = {'class': 'File', 'path': _file.id}
@@ -222,10 +222,23 @@ class FileProvider(object):
         file['href'] = href
         self.request_mocker.get('/files/{id}'.format(id=id), json=file)
 
-    def download_info_defined(self, id):
+    def download_info_defined(self, id, content=None):
         json = self.download_info()
         url = '/files/{id}/download_info'.format(id=id)
         self.request_mocker.get(url, json=json)
+        if content is not None:
+            self.content_available(json['url'], content)
+
+    def content_available(self, url, content):
+        self.request_mocker.get(url, content=content, headers={
+            'Content-Length': str(len(content))})
+        self.request_mocker.get(
+            url, request_headers={'Range': 'bytes=0-0'}, status_code=206,
+            content=content[:1], headers={
+                'Content-Length': '1',
+                'Content-Range': 'bytes 0-0/{}'.format(len(content))
+            }
+        )
 
     def can_be_copied(self, id=None, new_id=None):
         file = FileProvider.default_file()
@@ -532,3 +545,32 @@ class TaskProvider(object):
             '/tasks/{id}/execution_details'.format(id=id),
             json=execution_details
         )
+
+
+class RateLimitProvider(object):
+    def __init__(self, request_mocker, base_url):
+        self.request_mocker = request_mocker
+        self.base_url = base_url
+
+    @staticmethod
+    def rate(limit, remaining, reset):
+        return {
+            'limit': limit,
+            'remaining': remaining,
+            'reset': reset
+        }
+
+    def defined(self, limit, remaining, reset):
+        rate_limit = {
+            'rate': self.rate(limit, remaining, reset),
+            'instance_limit': self.rate(25, 25, 0)
+        }
+        self.request_mocker.get('/rate_limit', json=rate_limit)
+
+    @staticmethod
+    def headers(limit, remaining, reset):
+        return {
+            'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(reset)
+        }
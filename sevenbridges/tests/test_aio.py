@@ -0,0 +1,164 @@
+import asyncio
+
+import faker
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from sevenbridges.aio import AsyncApi
+from sevenbridges.errors import NotFound
+from sevenbridges.meta.aio import AsyncCollection
+from sevenbridges.models.aio import (
+    AsyncApp, AsyncFile, AsyncProject, AsyncTask
+)
+
+generator = faker.Factory.create()
+
+
+def async_api(base_url, handler):
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncApi(base_url, token=generator.uuid4(), session=session)
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def test_get_project(base_url):
+    id = '{}/{}'.format(generator.user_name(), generator.slug())
+
+    def handler(request):
+        assert request.url.path.endswith('/projects/{}'.format(id))
+        assert 'X-SBG-Auth-Token' in request.headers
+        return httpx.Response(200, json={'id': id, 'name': 'test'})
+
+    api = async_api(base_url, handler)
+    project = run(api.projects.get(id))
+
+    assert isinstance(project, AsyncProject)
+    assert project.id == id
+    assert project.name == 'test'
+
+
+def test_get_missing_project(base_url):
+    def handler(request):
+        return httpx.Response(404, json={'message': 'Not found'})
+
+    api = async_api(base_url, handler)
+    with pytest.raises(NotFound):
+        run(api.projects.get('my/missing'))
+
+
+def test_query_all_pages(base_url):
+    total = 5
+    limit = 2
+
+    def handler(request):
+        offset = int(request.url.params['offset'])
+        links = []
+        if offset + limit < total:
+            links.append({
+                'rel': 'next', 'method': 'GET',
+                'href': '{}/projects?offset={}&limit={}'.format(
+                    base_url, offset + limit, limit)
+            })
+        items = [{'id': 'my/project-{}'.format(i)}
+                 for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(
+            200, headers={'x-total-matching-query': str(total)},
+            json={'href': str(request.url), 'items': items, 'links': links}
+        )
+
+    api = async_api(base_url, handler)
+
+    async def fetch_all():
+        projects = await api.projects.query(offset=0, limit=limit)
+        assert isinstance(projects, AsyncCollection)
+        assert projects.total == total
+        return [project.id async for project in projects.all()]
+
+    ids = run(fetch_all())
+    assert ids == ['my/project-{}'.format(i) for i in range(total)]
+
+
+def test_create_and_run_task(base_url):
+    id = generator.uuid4()
+
+    def handler(request):
+        if request.url.path.endswith('/actions/run'):
+            return httpx.Response(200, json={'id': id, 'status': 'RUNNING'})
+        return httpx.Response(200, json={'id': id, 'status': 'DRAFT'})
+
+    api = async_api(base_url, handler)
+
+    async def create_and_run():
+        task = await api.tasks.create(
+            name='test', project='my/project', app='my/project/app',
+            inputs={'reads': 'value'}
+        )
+        assert task.status == 'DRAFT'
+        await task.run()
+        return task
+
+    task = run(create_and_run())
+    assert isinstance(task, AsyncTask)
+    assert task.status == 'RUNNING'
+
+
+def test_install_app(base_url):
+    id = 'my/project/app'
+
+    def handler(request):
+        if request.method == 'POST':
+            assert request.url.path.endswith('/apps/{}/raw'.format(id))
+            return httpx.Response(200, json={'sbg:id': id})
+        return httpx.Response(200, json={'id': id, 'revision': 0})
+
+    api = async_api(base_url, handler)
+    app = run(api.apps.install_app(id=id, raw={'class': 'Workflow'}))
+
+    assert isinstance(app, AsyncApp)
+    assert app.id == id
+
+
+def test_add_files_to_project(base_url):
+    copied = []
+
+    def handler(request):
+        copied.append(request.url.path)
+        return httpx.Response(200, json={'id': generator.uuid4()})
+
+    api = async_api(base_url, handler)
+    project = AsyncProject(api=api, id='my/project')
+    files = [AsyncFile(api=api, id=generator.uuid4()) for _ in range(3)]
+
+    run(project.add_files(files))
+
+    assert sorted(copied) == sorted(
+        '/files/{}/actions/copy'.format(file.id) for file in files
+    )
+
+
+def test_rate_limited_request_resubmitted(base_url, monkeypatch):
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+    responses = [
+        httpx.Response(429, headers={'Retry-After': '3'},
+                       json={'status': 429, 'message': 'Rate limited'}),
+        httpx.Response(200, json={'username': 'test'}),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    api = async_api(base_url, handler)
+    user = run(api.users.me())
+
+    assert user.username == 'test'
+    assert len(slept) == 1
+    assert 3 <= slept[0] <= 4
+    assert api.transport is None
@@ -0,0 +1,94 @@
+import time
+
+import faker
+import pytest
+
+from sevenbridges import Api, CircuitBreakers, RetryBudget
+from sevenbridges.errors import CircuitOpen, SbgError
+from sevenbridges.http.circuit import CircuitBreaker
+
+generator = faker.Factory.create()
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_circuit_opens_and_probes_half_open(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    breaker = CircuitBreaker('files', failure_threshold=2,
+                             recovery_timeout=10)
+
+    for _ in range(2):
+        breaker.allow()
+        breaker.record(503)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    clock.now += 10
+    breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    breaker.record(200)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+
+
+def test_failed_probe_reopens_circuit(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    breaker = CircuitBreaker('tasks', failure_threshold=1,
+                             recovery_timeout=10)
+    breaker.record_failure()
+
+    clock.now += 10
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+
+def test_retry_budget(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.exhausted == 1
+
+
+def test_api_circuit_per_endpoint_group(base_url, request_mocker):
+    # preconditions
+    breakers = CircuitBreakers(failure_threshold=2, recovery_timeout=60)
+    api = Api(base_url, token=generator.uuid4(), retry=0,
+              circuit_breakers=breakers)
+    files = request_mocker.get('/files/123', status_code=503,
+                               json={'message': 'Unavailable'})
+    request_mocker.get('/user', json={'username': 'user'})
+
+    # action
+    for _ in range(2):
+        with pytest.raises(SbgError):
+            api.files.get('123')
+    with pytest.raises(CircuitOpen):
+        api.files.get('123')
+    user = api.users.me()
+
+    # verification
+    assert files.call_count == 2
+    assert user.username == 'user'
+    assert breakers.states() == {'files': 'open', 'user': 'closed'}
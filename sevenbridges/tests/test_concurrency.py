@@ -0,0 +1,153 @@
+import time
+
+import faker
+import pytest
+
+from sevenbridges import Api
+from sevenbridges.errors import SbgError
+from sevenbridges.http.concurrency import AdaptiveConcurrency
+from sevenbridges.transfer.download import _download_chunk_limited
+
+generator = faker.Factory.create()
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class SlowBodySession(object):
+    """
+    Session answering after 50ms with a body taking a second per part.
+    """
+
+    def __init__(self, clock, parts):
+        self.clock = clock
+        self.parts = parts
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.clock.now += 0.05
+        return SlowBodySession.Response(self.clock, self.parts.pop(0))
+
+    class Response(object):
+        status_code = 200
+
+        def __init__(self, clock, parts):
+            self.clock = clock
+            self.parts = parts
+            self.headers = {'Content-Length': str(parts)}
+
+        def iter_content(self, chunk_size):
+            for _ in range(self.parts):
+                self.clock.now += 1.0
+                yield b'x'
+
+
+def test_concurrency_grows_additively_while_latency_is_stable():
+    # preconditions
+    concurrency = AdaptiveConcurrency(initial=2, maximum=4)
+
+    # action
+    for _ in range(20):
+        concurrency.acquire()
+        concurrency.release(latency=0.1)
+
+    # verification
+    assert concurrency.limit == 4
+    assert concurrency.in_flight == 0
+
+
+def test_concurrency_shrinks_multiplicatively_on_overload(monkeypatch):
+    # preconditions
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    concurrency = AdaptiveConcurrency(initial=16, maximum=16, cooldown=1)
+
+    # action
+    for _ in range(3):
+        concurrency.acquire()
+    for _ in range(3):
+        concurrency.release(overloaded=True)
+    limit_after_burst = concurrency.limit
+    clock.now += 1
+    concurrency.record_failure()
+
+    # verification
+    assert limit_after_burst == 8
+    assert concurrency.limit == 4
+
+
+def test_concurrency_shrinks_on_rising_latency():
+    # preconditions
+    concurrency = AdaptiveConcurrency(initial=8, maximum=8)
+    concurrency.acquire()
+    concurrency.release(latency=0.1)
+
+    # action
+    concurrency.acquire()
+    concurrency.release(latency=1.0)
+
+    # verification
+    assert concurrency.limit == 4
+
+
+def test_concurrency_limits_in_flight_operations():
+    # preconditions
+    concurrency = AdaptiveConcurrency(initial=2, maximum=2)
+
+    # action
+    taken = [concurrency.try_acquire() for _ in range(3)]
+
+    # verification
+    assert taken == [True, True, False]
+    assert concurrency.in_flight == 2
+
+
+def test_concurrency_run_counts_server_errors_as_overload():
+    # preconditions
+    concurrency = AdaptiveConcurrency(initial=4, maximum=4, cooldown=0)
+
+    def fail(status):
+        raise SbgError(message=generator.name(), status=status)
+
+    # action
+    with pytest.raises(SbgError):
+        concurrency.run(fail, 503)
+    with pytest.raises(SbgError):
+        concurrency.run(fail, 404)
+
+    # verification
+    assert concurrency.limit == 2
+    assert concurrency.in_flight == 0
+
+
+def test_download_concurrency_ignores_chunk_transfer_time(monkeypatch,
+                                                          tmpdir):
+    # preconditions
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    session = SlowBodySession(clock, parts=[1] + [20] * 20)
+    concurrency = AdaptiveConcurrency(initial=16, maximum=16, cooldown=0)
+    path = str(tmpdir.join('download'))
+
+    # action
+    for _ in range(21):
+        concurrency.acquire()
+        _download_chunk_limited(concurrency, path, session,
+                                generator.url(), 1, 10, 0, None)
+
+    # verification
+    assert concurrency.limit == 16
+    assert concurrency.in_flight == 0
+
+
+def test_download_concurrency_starts_at_max_workers(base_url):
+    # action
+    api = Api(base_url, token=generator.uuid4(), download_max_workers=16)
+
+    # verification
+    assert api.download_concurrency.limit == 16
+    assert api.download_concurrency.minimum == 4
@@ -0,0 +1,126 @@
+import time
+
+import faker
+import pytest
+
+from sevenbridges import Api
+from sevenbridges.errors import TooManyRequests
+from sevenbridges.http.circuit import RetryBudget
+from sevenbridges.http.error_handlers import RateLimitSleeper
+from sevenbridges.tests.providers import RateLimitProvider
+
+generator = faker.Factory.create()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, 'sleep', slept.append)
+    return slept
+
+
+def rate_limited(reset):
+    return {
+        'status_code': 429,
+        'json': {'status': 429, 'message': 'Rate limit exceeded'},
+        'headers': RateLimitProvider.headers(1000, 0, reset)
+    }
+
+
+def test_rate_limited_request_resubmitted(api, request_mocker, sleeps):
+    # preconditions
+    reset = int(time.time()) + 20
+    username = generator.user_name()
+    request_mocker.get('/user', [
+        rate_limited(reset), {'json': {'username': username}}
+    ])
+
+    # action
+    user = api.users.me()
+
+    # verification
+    assert user.username == username
+    assert len(sleeps) == 1
+    assert 18 < sleeps[0] <= 21
+    assert request_mocker.call_count == 2
+
+
+def test_retry_after_header_preferred(api, request_mocker, sleeps):
+    # preconditions
+    response = rate_limited(int(time.time()) + 600)
+    response['headers']['Retry-After'] = '3'
+    request_mocker.get('/user', [response, {'json': {}}])
+
+    # action
+    api.users.me()
+
+    # verification
+    assert 3 <= sleeps[0] <= 4
+
+
+def test_post_not_resubmitted(api, request_mocker, sleeps):
+    # preconditions
+    request_mocker.post('/projects', [
+        rate_limited(int(time.time()) + 20), {'json': {}}
+    ])
+
+    # action
+    with pytest.raises(TooManyRequests):
+        api.projects.create(name='test', billing_group=generator.uuid4())
+
+    # verification
+    assert not sleeps
+
+
+def test_wait_ceiling(base_url, request_mocker, sleeps):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), error_handlers=[
+        RateLimitSleeper(max_wait=60)
+    ])
+    request_mocker.get('/user', [
+        rate_limited(int(time.time()) + 3600), {'json': {}}
+    ])
+
+    # action
+    with pytest.raises(TooManyRequests):
+        api.users.me()
+
+    # verification
+    assert not sleeps
+
+
+def test_resubmission_draws_from_retry_budget(base_url, request_mocker,
+                                              sleeps):
+    # preconditions
+    budget = RetryBudget(min_per_second=0, max_tokens=0)
+    api = Api(base_url, token=generator.uuid4(), retry_budget=budget)
+    request_mocker.get('/user', [
+        rate_limited(int(time.time()) + 20), {'json': {}}
+    ])
+
+    # action
+    with pytest.raises(TooManyRequests):
+        api.users.me()
+
+    # verification
+    assert not sleeps
+    assert budget.exhausted == 1
+    assert request_mocker.call_count == 1
+
+
+def test_jitter_bounded_by_deadline(base_url, request_mocker, sleeps):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), error_handlers=[
+        RateLimitSleeper(jitter=60)
+    ])
+    request_mocker.get('/user', [
+        rate_limited(int(time.time()) + 20), {'json': {}}
+    ])
+
+    # action
+    with api.deadline(25):
+        api.users.me()
+
+    # verification
+    assert len(sleeps) == 1
+    assert sleeps[0] <= 25
@@ -24,6 +24,58 @@ def test_files_query(api, given, verifier):
     verifier.file.queried(project=project.id)
 
 
+def test_files_query_raw(api, given, verifier):
+    # preconditions
+    total = 10
+    id = '{}/{}'.format(generator.user_name(), generator.slug())
+    given.file.files_exist_for_project(id, total)
+
+    # action
+    files = api.files.query(project=id, limit=10, raw=True)
+
+    # verification
+    assert files.total == total
+    assert all(isinstance(file, dict) for file in files)
+    assert [file['id'] for file in files.all()] == [
+        file['id'] for file in files
+    ]
+    verifier.file.queried(project=id)
+
+
+def test_files_get_partial(api, request_mocker):
+    # preconditions
+    id = generator.uuid4()
+    name = generator.user_name()
+    request_mocker.get('/files/{}'.format(id), json={'id': id, 'name': name})
+
+    # action
+    file = api.files.get(id, fields=['id', 'name'])
+
+    # verification
+    assert file.name == name
+    assert file.size is None
+    assert file.metadata is None
+    assert request_mocker.call_count == 1
+    assert request_mocker.last_request.qs == {'fields': ['id,name']}
+
+
+def test_files_query_partial(api, given, request_mocker):
+    # preconditions
+    total = 10
+    id = '{}/{}'.format(generator.user_name(), generator.slug())
+    given.file.files_exist_for_project(id, total)
+
+    # action
+    files = api.files.query(project=id, fields='id,name,!metadata')
+
+    # verification
+    assert len(files) == total
+    assert all(file.size is None for file in files)
+    assert request_mocker.call_count == 1
+    assert request_mocker.last_request.qs['fields'] == ['id,name,!metadata']
+    assert files.fields == ['id', 'name', '!metadata']
+
+
 def test_files_query_file_name(api, given, verifier):
     # preconditions
     total = 10
@@ -121,6 +173,28 @@ def test_files_download_info(api, given, verifier):
     verifier.file.download_info_fetched(id)
 
 
+def test_files_download(api, given, verifier, tmpdir):
+    # precondition
+    id = generator.uuid4()
+    content = generator.text().encode('utf-8')
+    given.file.exists(id=id)
+    given.file.download_info_defined(id=id, content=content)
+    path = str(tmpdir.join('downloaded'))
+
+    # action
+    file = api.files.get(id)
+    download = file.download(path, wait=False)
+    download.start()
+    download.wait()
+
+    # verification
+    assert download._session is api.download_session
+    assert download._file_size == len(content)
+    with open(path, 'rb') as fp:
+        assert fp.read() == content
+    verifier.file.download_info_fetched(id)
+
+
 def test_files_save(api, given, verifier):
     # precondition
     id = generator.uuid4()
@@ -135,3 +209,22 @@ def test_files_save(api, given, verifier):
 
     # verifier
     verifier.file.file_saved(id)
+
+
+def test_count_files(api, request_mocker):
+    # preconditions
+    project = '{}/{}'.format(generator.user_name(), generator.slug())
+    request_mocker.get('/files', json={
+        'href': api.url + '/files', 'items': [], 'links': []
+    }, headers={'x-total-matching-query': '7'})
+
+    # action
+    count = api.files.count(project=project,
+                            metadata={'sample_type': 'tumor'})
+
+    # verification
+    assert count == 7
+    assert request_mocker.last_request.qs['metadata.sample_type'] == [
+        'tumor'
+    ]
+    assert request_mocker.last_request.qs['limit'] == ['1']
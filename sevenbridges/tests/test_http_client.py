@@ -0,0 +1,586 @@
+import gzip
+import io
+import json
+import threading
+import time
+
+import faker
+import pytest
+import requests
+from six.moves import BaseHTTPServer
+
+from sevenbridges import Api, ConditionalCache, FlightRecorder, Hedging
+from sevenbridges.errors import (
+    DeadlineExceeded, NotFound, SbgError, TooManyRequests
+)
+from sevenbridges.http.codec import JsonCodec, default_codec
+from sevenbridges.http.metrics import Metrics
+from sevenbridges.http.transport import InMemoryTransport
+from sevenbridges.tests.providers import RateLimitProvider
+
+generator = faker.Factory.create()
+
+
+def test_request_context_per_thread(api, request_mocker):
+    # preconditions
+    request_ids = {}
+    barrier = threading.Barrier(2)
+    request_mocker.get('/users/first', json={'username': 'first'},
+                       headers={'X-Request-Id': 'first-request'})
+    request_mocker.get('/users/second', json={'username': 'second'},
+                       headers={'X-Request-Id': 'second-request'})
+
+    def worker(username):
+        api.users.get(username)
+        barrier.wait()
+        request_ids[username] = api.request_id
+
+    # action
+    threads = [threading.Thread(target=worker, args=(username,))
+               for username in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # verification
+    assert request_ids == {
+        'first': 'first-request', 'second': 'second-request'
+    }
+
+
+def test_collection_context(api, given):
+    # preconditions
+    given.project.paginated_projects(2, 4)
+
+    # action
+    projects = api.projects.query(offset=0, limit=2)
+
+    # verification
+    assert projects.context.status_code == 200
+    assert api.context is projects.context
+
+
+def test_rate_limit_aggregate_only_decreases(api, request_mocker):
+    # preconditions
+    reset = 2000000000
+    request_mocker.get('/user', [
+        {'json': {}, 'headers': RateLimitProvider.headers(1000, 10, reset)},
+        {'json': {}, 'headers': RateLimitProvider.headers(1000, 20, reset)},
+        {'json': {}, 'headers': RateLimitProvider.headers(1000, 999,
+                                                          reset + 300)},
+    ])
+
+    # action and verification
+    api.users.me()
+    assert api.rate_limit_state == (1000, 10, reset)
+    api.users.me()
+    assert api.remaining == 10
+    assert api.context.remaining == 20
+    api.users.me()
+    assert api.rate_limit_state == (1000, 999, reset + 300)
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def dumps(self, data):
+        self.encoded += 1
+        return super(CountingCodec, self).dumps(data)
+
+    def loads(self, content):
+        self.decoded += 1
+        return super(CountingCodec, self).loads(content)
+
+
+def test_codec_used_for_requests_and_responses(base_url, given):
+    # preconditions
+    codec = CountingCodec()
+    api = Api(base_url, token=generator.uuid4(), codec=codec)
+    given.project.paginated_projects(2, 4)
+    given.project.can_be_created(name='test')
+
+    # action
+    projects = api.projects.query(offset=0, limit=2)
+    all_projects = list(projects.all())
+    api.projects.create(name='test', billing_group=generator.uuid4())
+
+    # verification
+    assert len(all_projects) == 4
+    assert codec.encoded == 4
+    assert codec.decoded == 4
+
+
+@pytest.mark.parametrize('codec', [JsonCodec(), default_codec()])
+def test_codec_round_trip(codec):
+    data = {'name': u'šample', 'inputs': [1, 2.5, None, True]}
+    assert codec.loads(codec.dumps(data)) == data
+
+
+def test_metrics_grouped_by_url_template(api, given, request_mocker):
+    # preconditions
+    ids = [generator.uuid4() for _ in range(3)]
+    for id in ids:
+        given.file.exists(id=id)
+    request_mocker.get('/files/missing', status_code=404,
+                       json={'message': 'Not found'})
+
+    # action
+    for id in ids:
+        api.files.get(id)
+    with pytest.raises(NotFound):
+        api.files.get('missing')
+
+    # verification
+    metrics = api.metrics['GET /files/{id}']
+    assert metrics['count'] == 4
+    assert metrics['statuses'] == {200: 3, 404: 1}
+    assert metrics['bytes_received'] > 0
+    assert metrics['latency']['p99'] >= metrics['latency']['p50']
+    assert 'GET /files/{}'.format(ids[0]) not in api.metrics
+
+
+@pytest.mark.parametrize('path,template', [
+    ('/', '/'),
+    ('/projects', '/projects'),
+    ('/projects/owner/project', '/projects/{id}'),
+    ('/projects/owner/project/members/user',
+     '/projects/{id}/members/{member}'),
+    ('/apps/owner/project/app', '/apps/{id}'),
+    ('/apps/owner/project/app/3', '/apps/{id}/{revision}'),
+    ('/apps/owner/project/app/raw', '/apps/{id}/raw'),
+    ('/files/123/actions/copy', '/files/{id}/actions/copy'),
+])
+def test_url_template_resolution(api, path, template):
+    assert Metrics(api.url).template(api.url + path) == template
+
+
+def test_metrics_count_retries(api, request_mocker, monkeypatch):
+    # preconditions
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    request_mocker.get('/user', [
+        {'status_code': 429, 'json': {},
+         'headers': RateLimitProvider.headers(100, 0, int(time.time()))},
+        {'json': {}}
+    ])
+
+    # action
+    api.users.me()
+
+    # verification
+    assert api.metrics['GET /user']['retries'] == 1
+    api.reset_metrics()
+    assert api.metrics == {}
+
+
+def test_conditional_get_reuses_cached_body(base_url, request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(),
+              conditional_cache=ConditionalCache())
+    project = {'id': 'owner/project', 'name': 'project'}
+    matcher = request_mocker.get('/projects/owner/project', [
+        {'json': project, 'headers': {'ETag': '"v1"'}},
+        {'status_code': 304, 'headers': {'ETag': '"v1"'}},
+    ])
+
+    # action
+    first = api.projects.get('owner/project')
+    second = api.projects.get('owner/project')
+
+    # verification
+    assert 'If-None-Match' not in matcher.request_history[0].headers
+    assert matcher.request_history[1].headers['If-None-Match'] == '"v1"'
+    assert first.name == second.name == 'project'
+    metrics = api.metrics['GET /projects/{id}']
+    assert metrics['statuses'] == {200: 1, 304: 1}
+
+
+def test_conditional_get_refetched_after_eviction(base_url, request_mocker):
+    # preconditions
+    cache = ConditionalCache()
+    api = Api(base_url, token=generator.uuid4(), conditional_cache=cache)
+    project = {'id': 'owner/project', 'name': 'project'}
+
+    def not_modified(request, context):
+        # Entry is evicted by another thread while the request is sent.
+        cache.clear()
+        context.status_code = 304
+        return ''
+
+    matcher = request_mocker.get('/projects/owner/project', [
+        {'json': project, 'headers': {'ETag': '"v1"'}},
+        {'text': not_modified},
+        {'json': project, 'headers': {'ETag': '"v1"'}},
+    ])
+
+    # action
+    api.projects.get('owner/project')
+    second = api.projects.get('owner/project')
+
+    # verification
+    assert second.name == 'project'
+    assert matcher.call_count == 3
+    assert 'If-None-Match' not in matcher.request_history[2].headers
+    assert len(cache) == 1
+
+
+def test_conditional_cache_discards_missing_resources(base_url,
+                                                      request_mocker):
+    # preconditions
+    cache = ConditionalCache()
+    api = Api(base_url, token=generator.uuid4(), conditional_cache=cache)
+    request_mocker.get('/user', [
+        {'json': {}, 'headers': {'Last-Modified': 'Mon, 01 Jan 2018'}},
+        {'status_code': 404, 'json': {'message': 'Not found'}},
+    ])
+
+    # action
+    api.users.me()
+    assert len(cache) == 1
+    with pytest.raises(NotFound):
+        api.users.me()
+
+    # verification
+    assert len(cache) == 0
+
+
+def test_concurrent_identical_gets_are_coalesced(base_url, request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), coalesce=True)
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        return {'username': 'user'}
+
+    matcher = request_mocker.get('/user', json=respond)
+    users = []
+
+    def fetch():
+        users.append(api.users.me())
+
+    # action
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while not matcher.call_count:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # verification
+    assert matcher.call_count == 1
+    assert len(users) == 5
+    assert all(user.username == 'user' for user in users)
+    assert len(api._single_flight) == 0
+
+
+def test_coalesced_get_follower_keeps_its_deadline(base_url,
+                                                   request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), coalesce=True)
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        return {'username': 'user'}
+
+    matcher = request_mocker.get('/user', json=respond)
+    leader = threading.Thread(target=api.users.me)
+    leader.start()
+    while not matcher.call_count:
+        time.sleep(0.01)
+
+    # action
+    started = time.time()
+    try:
+        with api.deadline(0.2):
+            with pytest.raises(DeadlineExceeded):
+                api.users.me()
+        elapsed = time.time() - started
+    finally:
+        release.set()
+        leader.join()
+
+    # verification
+    assert elapsed < 1
+    assert matcher.call_count == 1
+
+
+def test_large_request_bodies_are_compressed(base_url, request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), compress_threshold=1024)
+    matcher = request_mocker.post('/tasks', json={'id': generator.uuid4()})
+    small = {'name': 'task'}
+    large = {'name': 'task', 'inputs': {'reads': ['x' * 100] * 100}}
+
+    # action
+    api.post('/tasks', data=small)
+    api.post('/tasks', data=large)
+
+    # verification
+    first, second = matcher.request_history
+    assert 'Content-Encoding' not in first.headers
+    assert second.headers['Content-Encoding'] == 'gzip'
+    assert second.headers['Accept-Encoding'] == 'gzip, deflate'
+    body = gzip.GzipFile(fileobj=io.BytesIO(second.body)).read()
+    assert json.loads(body.decode('utf-8')) == large
+    assert len(second.body) < len(body)
+
+
+def test_deadline_caps_attempt_timeouts(base_url, request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(), timeout=(5, 30))
+    matcher = request_mocker.get('/user', json={})
+
+    # action
+    with api.deadline(10):
+        with api.deadline(60) as deadline:
+            api.users.me()
+
+    # verification
+    connect, read = matcher.request_history[0].timeout
+    assert connect <= 5
+    assert read <= 10
+    assert deadline.timeout == 10
+    assert api.active_deadline is None
+
+
+def test_expired_deadline_stops_pagination(api, given, request_mocker):
+    # preconditions
+    given.project.paginated_projects(2, 4)
+    projects = api.projects.query(offset=0, limit=2)
+    calls = request_mocker.call_count
+
+    # action
+    with api.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            list(projects.all())
+
+    # verification
+    assert request_mocker.call_count == calls
+
+
+class SlowHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    delay = 1.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+        except IOError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def test_deadline_stops_retries_of_slow_requests():
+    # preconditions
+    server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    api = Api('http://127.0.0.1:{}'.format(server.server_address[1]),
+              token=generator.uuid4())
+
+    # action
+    started = time.time()
+    try:
+        with api.deadline(0.5):
+            with pytest.raises(DeadlineExceeded):
+                api.get('/user')
+        elapsed = time.time() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # verification
+    assert elapsed < 1.0
+
+
+def test_deadline_bounds_rate_limit_waits(base_url, request_mocker,
+                                          monkeypatch):
+    # preconditions
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    api = Api(base_url, token=generator.uuid4(), request_deadline=5)
+    request_mocker.get('/user', [
+        {'status_code': 429, 'json': {}, 'headers': {'Retry-After': '60'}},
+        {'json': {}}
+    ])
+
+    # action
+    with pytest.raises(TooManyRequests):
+        api.users.me()
+
+    # verification
+    assert request_mocker.call_count == 1
+
+
+def test_slow_gets_are_hedged(base_url):
+    # preconditions
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(1)
+            return 200, {}, {'username': 'slow'}
+        return 200, {}, {'username': 'fast'}
+
+    hedging = Hedging(initial_delay=0.05)
+    api = Api(base_url, token=generator.uuid4(), hedging=hedging,
+              transport=InMemoryTransport(handler))
+
+    # action
+    started = time.time()
+    user = api.users.me()
+
+    # verification
+    assert user.username == 'fast'
+    assert time.time() - started < 1
+    assert hedging.hedged == 1
+    assert hedging.hedge_wins == 1
+    assert api.context.status_code == 200
+
+
+def test_fast_gets_are_not_hedged(base_url, request_mocker):
+    # preconditions
+    hedging = Hedging(initial_delay=1)
+    api = Api(base_url, token=generator.uuid4(), hedging=hedging)
+    matcher = request_mocker.get('/user', json={'username': 'user'})
+
+    # action
+    for _ in range(3):
+        api.users.me()
+
+    # verification
+    assert matcher.call_count == 3
+    assert hedging.hedged == 0
+
+
+def test_saturated_hedging_runs_on_calling_thread(base_url):
+    # preconditions
+    release = threading.Event()
+    threads = []
+
+    def handler(request):
+        threads.append(threading.current_thread())
+        if request.url.endswith('/slow'):
+            release.wait(5)
+        return 200, {}, {'username': 'user'}
+
+    hedging = Hedging(initial_delay=0.01, max_workers=1)
+    api = Api(base_url, token=generator.uuid4(), hedging=hedging,
+              transport=InMemoryTransport(handler))
+    slow = threading.Thread(target=api.get, args=('/slow',))
+    slow.start()
+    while not threads:
+        time.sleep(0.01)
+
+    # action
+    try:
+        user = api.users.me()
+    finally:
+        release.set()
+        slow.join()
+
+    # verification
+    assert user.username == 'user'
+    assert threads[1] is threading.current_thread()
+    assert hedging.hedged == 0
+
+
+def test_hedging_delay_follows_endpoint_latency(api):
+    # preconditions
+    metrics = Metrics(api.url)
+    hedging = Hedging(percentile=90, min_samples=10)
+    url = api.url + '/files/123'
+    assert hedging.delay(metrics, 'GET', url) is None
+
+    # action
+    for latency in [0.01] * 9 + [0.5]:
+        metrics.record('GET', url, latency, status_code=200)
+
+    # verification
+    assert 0.01 <= hedging.delay(metrics, 'GET', api.url + '/files/456') < 0.5
+
+
+def test_sessions_per_thread_share_connection_pool(api, request_mocker):
+    # preconditions
+    request_mocker.get('/user', json={'username': 'user'})
+    sessions = []
+
+    def fetch():
+        api.users.me()
+        sessions.append(api.session)
+
+    # action
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # verification
+    assert len(set(id(session) for session in sessions)) == 4
+    adapters = set(id(session.adapters[api.url]) for session in sessions)
+    assert len(adapters) == 1
+    assert 'X-SBG-Auth-Token' not in api.session.headers
+
+
+def test_flight_recorder_keeps_most_recent_requests(base_url,
+                                                    request_mocker):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4(),
+              flight_recorder=FlightRecorder(capacity=2))
+    request_id = generator.uuid4()
+    request_mocker.get('/user', json={'username': generator.user_name()})
+    request_mocker.get('/files/missing', status_code=404,
+                       json={'message': 'Not found'},
+                       headers={'X-Request-Id': request_id})
+    request_mocker.get('/projects/owner/project',
+                       exc=requests.ConnectTimeout)
+
+    # action
+    api.users.me()
+    with pytest.raises(NotFound):
+        api.files.get('missing')
+    with pytest.raises(SbgError):
+        api.projects.get('owner/project')
+
+    # verification
+    records = api.flight_recorder.records()
+    assert len(records) == 2
+    assert records[0]['template'] == '/files/{id}'
+    assert records[0]['status'] == 404
+    assert records[0]['request_id'] == request_id
+    assert records[0]['bytes_received'] > 0
+    assert records[1]['status'] is None
+    assert records[1]['error'] == 'ConnectTimeout'
+
+
+def test_flight_recorder_dumps_on_error(api, request_mocker, tmpdir):
+    # preconditions
+    path = str(tmpdir.join('requests.json'))
+    request_mocker.get('/files/missing', status_code=404,
+                       json={'message': 'Not found'})
+
+    # action
+    with pytest.raises(NotFound):
+        with api.flight_recorder.dump_on_error(path):
+            api.files.get('missing')
+
+    # verification
+    with open(path) as fp:
+        records = json.load(fp)
+    assert [record['method'] for record in records] == ['GET']
+    assert records[0]['url'] == api.url + '/files/missing'
+    assert json.loads(api.flight_recorder.dump()) == records
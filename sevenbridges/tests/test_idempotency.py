@@ -0,0 +1,203 @@
+import time
+from datetime import datetime
+
+import faker
+import pytest
+import requests
+
+from sevenbridges import Api
+from sevenbridges.errors import BadRequest, DeadlineExceeded, SbgError
+from sevenbridges.http.idempotency import FileJournal, Idempotency, Journal
+from sevenbridges.tests.providers import FileProvider, TaskProvider
+
+generator = faker.Factory.create()
+
+
+@pytest.fixture
+def idempotent_api(base_url):
+    return Api(base_url, token=generator.uuid4(),
+               idempotency=Idempotency(backoff=0))
+
+
+def page(href, items):
+    return {'href': href, 'items': items, 'links': []}
+
+
+def timestamp(offset):
+    return datetime.utcfromtimestamp(time.time() + offset).strftime(
+        '%Y-%m-%dT%H:%M:%SZ')
+
+
+def test_file_copy_reconciled_after_connection_error(idempotent_api, given,
+                                                     request_mocker,
+                                                     base_url):
+    # preconditions
+    id = generator.uuid4()
+    given.file.exists(id=id, name='reads.fastq')
+    copy = request_mocker.post('/files/{}/actions/copy'.format(id),
+                               exc=requests.ConnectionError)
+    copied = FileProvider.default_file()
+    copied.update(name='reads.fastq', created_on=timestamp(1))
+    request_mocker.get('/files', json=page(base_url + '/files', [copied]),
+                       headers={'x-total-matching-query': '1'})
+
+    # action
+    file = idempotent_api.files.get(id)
+    new_file = file.copy(project='my/other-project')
+
+    # verification
+    assert new_file.id == copied['id']
+    assert copy.call_count == 1
+    assert 'Idempotency-Key' in copy.request_history[0].headers
+
+
+def test_file_copy_ignores_files_created_before(idempotent_api, given,
+                                                request_mocker, base_url):
+    # preconditions
+    id = generator.uuid4()
+    given.file.exists(id=id, name='reads.fastq')
+    copied = FileProvider.default_file()
+    copy = request_mocker.post('/files/{}/actions/copy'.format(id), [
+        {'exc': requests.ConnectionError},
+        {'json': copied},
+    ])
+    existing = FileProvider.default_file()
+    existing.update(name='reads.fastq', created_on=timestamp(-3600))
+    request_mocker.get('/files', json=page(base_url + '/files', [existing]),
+                       headers={'x-total-matching-query': '1'})
+
+    # action
+    file = idempotent_api.files.get(id)
+    new_file = file.copy(project='my/other-project')
+
+    # verification
+    assert new_file.id == copied['id']
+    assert copy.call_count == 2
+
+
+def test_task_create_retried_with_same_key(idempotent_api, request_mocker,
+                                           base_url):
+    # preconditions
+    task = TaskProvider.default_task()
+    create = request_mocker.post('/tasks', [
+        {'exc': requests.ConnectionError},
+        {'json': task},
+    ])
+    query = request_mocker.get(
+        '/tasks', json=page(base_url + '/tasks', []),
+        headers={'x-total-matching-query': '0'}
+    )
+
+    # action
+    created = idempotent_api.tasks.create(
+        name=task['name'], project=task['project'], app=task['app'],
+        inputs={}
+    )
+
+    # verification
+    assert created.id == task['id']
+    keys = [r.headers['Idempotency-Key'] for r in create.request_history]
+    assert len(keys) == 2
+    assert keys[0] == keys[1]
+    params = query.last_request.qs
+    assert params['status'] == ['draft']
+    assert params['order_by'] == ['created_time']
+    assert params['order'] == ['desc']
+    assert 'created_from' in params
+
+
+def test_task_create_reconciled_without_app_revision(idempotent_api,
+                                                     request_mocker,
+                                                     base_url):
+    # preconditions
+    task = TaskProvider.default_task()
+    task['created_time'] = timestamp(1)
+    create = request_mocker.post('/tasks', exc=requests.ConnectionError)
+    request_mocker.get('/tasks', json=page(base_url + '/tasks', [task]),
+                       headers={'x-total-matching-query': '1'})
+
+    # action
+    created = idempotent_api.tasks.create(
+        name=task['name'], project=task['project'],
+        app=task['app'].rsplit('/', 1)[0], inputs={}
+    )
+
+    # verification
+    assert created.id == task['id']
+    assert create.call_count == 1
+
+
+def test_operation_past_deadline_stays_pending(idempotent_api):
+    # preconditions
+    sent = []
+
+    def send(headers):
+        sent.append(headers)
+        raise DeadlineExceeded('Deadline exceeded.')
+
+    # action
+    with pytest.raises(DeadlineExceeded):
+        idempotent_api.idempotent(None, send, lambda since: [], key='copy')
+
+    # verification
+    assert len(sent) == 1
+    entry = idempotent_api.idempotency.journal.get('copy')
+    assert entry['state'] == Journal.PENDING
+
+
+def test_retry_backoff_capped_by_deadline(base_url, monkeypatch):
+    # preconditions
+    slept = []
+    monkeypatch.setattr(time, 'sleep', slept.append)
+    api = Api(base_url, token=generator.uuid4(),
+              idempotency=Idempotency(retries=1, backoff=60))
+
+    def send(headers):
+        raise SbgError(message='Connection aborted.')
+
+    # action
+    with api.deadline(5):
+        with pytest.raises(SbgError):
+            api.idempotent(None, send, lambda since: [], key='copy')
+
+    # verification
+    assert len(slept) == 1
+    assert slept[0] <= 5
+
+
+def test_journal_skips_completed_operations(base_url, request_mocker,
+                                            tmpdir):
+    # preconditions
+    path = str(tmpdir.join('journal'))
+    task = TaskProvider.default_task()
+    create = request_mocker.post('/tasks', json=task)
+
+    # action
+    for _ in range(2):
+        api = Api(base_url, token=generator.uuid4(),
+                  idempotency=Idempotency(journal=FileJournal(path)))
+        created = api.tasks.create(
+            name=task['name'], project=task['project'], app=task['app'],
+            inputs={}, idempotency_key='sample-1'
+        )
+
+    # verification
+    assert create.call_count == 1
+    assert created.id == task['id']
+
+
+def test_rejected_operation_is_not_retried(idempotent_api, request_mocker):
+    # preconditions
+    create = request_mocker.post('/tasks', status_code=400,
+                                 json={'message': 'Invalid app'})
+
+    # action
+    with pytest.raises(BadRequest):
+        idempotent_api.tasks.create(
+            name='task', project='my/project', app='my/project/app',
+            inputs={}, idempotency_key='task'
+        )
+
+    # verification
+    assert create.call_count == 1
+    assert idempotent_api.idempotency.journal.get('task') is None
@@ -1,4 +1,10 @@
+import threading
+import time
+
 import faker
+import pytest
+
+from sevenbridges.errors import SbgError
 
 generator = faker.Factory.create()
 
@@ -44,3 +50,139 @@ def test_single_page_back(api, given, verifier):
     # verification
     projects.previous_page()
     verifier.project.queried(2, limit)
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_all_pages_parallel(api, given, verifier, ordered):
+    # preconditions
+    limit = 2
+    total = 11
+    given.project.paginated_projects(limit, total)
+    projects = api.projects.query(offset=0, limit=limit)
+    expected = [project.name for project in projects.all()]
+
+    # action
+    names = [project.name for project in
+             projects.all(parallel=True, max_workers=3, ordered=ordered)]
+
+    # verification
+    if ordered:
+        assert names == expected
+    else:
+        assert sorted(names) == sorted(expected)
+    for i in range(0, total, limit):
+        verifier.project.queried(i, limit)
+
+
+def test_all_pages_parallel_keeps_deadline(api, given):
+    # preconditions
+    limit = 2
+    total = 6
+    given.project.paginated_projects(limit, total)
+    projects = api.projects.query(offset=0, limit=limit)
+    deadlines = []
+    load = projects._load
+
+    def tracked_load(url):
+        deadlines.append(api.active_deadline)
+        return load(url)
+
+    projects._load = tracked_load
+
+    # action
+    with api.deadline(60) as deadline:
+        items = list(projects.all(parallel=True))
+
+    # verification
+    assert len(items) == total
+    assert deadlines == [deadline] * 3
+
+
+def test_all_pages_prefetched(api, given, verifier):
+    # preconditions
+    limit = 2
+    total = 10
+    given.project.paginated_projects(limit, total)
+    projects = api.projects.query(offset=0, limit=limit)
+    expected = [project.name for project in projects.all()]
+
+    # action
+    names = [project.name for project in projects.all(prefetch=2)]
+
+    # verification
+    assert names == expected
+    for i in range(0, total, limit):
+        verifier.project.queried(i, limit)
+
+
+def test_all_pages_prefetched_raises_errors(api, given, request_mocker):
+    # preconditions
+    limit = 2
+    total = 6
+    given.project.paginated_projects(limit, total)
+    request_mocker.get(
+        api.url + '/projects?offset=4&limit=2', status_code=500,
+        json={'message': 'Server error'}
+    )
+    projects = api.projects.query(offset=0, limit=limit)
+
+    # action
+    names = []
+    with pytest.raises(SbgError):
+        for project in projects.all(prefetch=1):
+            names.append(project.name)
+
+    # verification
+    assert len(names) == 4
+
+
+def test_all_pages_prefetched_stops_when_closed(api, given):
+    # preconditions
+    limit = 2
+    total = 20
+    given.project.paginated_projects(limit, total)
+    projects = api.projects.query(offset=0, limit=limit)
+    items = projects.all(prefetch=1)
+
+    # action
+    next(items)
+    items.close()
+    time.sleep(0.3)
+
+    # verification
+    assert 'collection-read-ahead' not in [
+        thread.name for thread in threading.enumerate()
+    ]
+
+
+def test_all_pages_raw(api, given):
+    # preconditions
+    limit = 2
+    total = 10
+    given.project.paginated_projects(limit, total)
+
+    # action
+    projects = api.projects.query(offset=0, limit=limit, raw=True)
+    items = list(projects.all(parallel=True))
+
+    # verification
+    assert len(items) == total
+    assert all(isinstance(item, dict) for item in items)
+
+
+def test_all_pages_keep_field_projection(api, given, request_mocker):
+    # preconditions
+    limit = 2
+    total = 6
+    given.project.paginated_projects(limit, total)
+
+    # action
+    projects = api.projects.query(offset=0, limit=limit, fields=['name'])
+    names = [project.name for project in projects.all()]
+
+    # verification
+    assert len(names) == total
+    assert all(name is not None for name in names)
+    assert [
+        request.qs.get('fields') for request in request_mocker.request_history
+    ] == [['name']] * 4
@@ -1,6 +1,7 @@
 import faker
 import pytest
 
+from sevenbridges import Priority
 from sevenbridges.errors import SbgError, ResourceNotModified
 
 generator = faker.Factory.create()
@@ -215,3 +216,48 @@ def test_member_permissions_save_no_changes(api, given, verifier):
     member.permissions.read = True
     with pytest.raises(ResourceNotModified):
         member.save()
+
+
+def test_project_add_files(api, given, verifier):
+    # preconditions
+    api.bulk_concurrency.maximum = 2
+    project_id = generator.slug()
+    given.project.exists(id=project_id)
+    ids = [generator.uuid4() for _ in range(3)]
+    for id in ids:
+        given.file.exists(id=id)
+        given.file.can_be_copied(id=id, new_id=generator.uuid4())
+
+    # action
+    project = api.projects.get(project_id)
+    project.add_files([api.files.get(id) for id in ids])
+
+    # verification
+    for id in ids:
+        verifier.file.file_copied(id)
+    assert api.bulk_concurrency.in_flight == 0
+
+
+def test_project_add_files_keeps_caller_context(api, given,
+                                                request_mocker):
+    # preconditions
+    project_id = generator.slug()
+    given.project.exists(id=project_id)
+    id = generator.uuid4()
+    given.file.exists(id=id)
+    contexts = []
+
+    def copy(request, context):
+        contexts.append((api.active_deadline, api.active_priority))
+        return {'id': generator.uuid4()}
+
+    request_mocker.post('/files/{}/actions/copy'.format(id), json=copy)
+    project = api.projects.get(project_id)
+    file = api.files.get(id)
+
+    # action
+    with api.deadline(60) as deadline, api.priority(Priority.HIGH):
+        project.add_files([file])
+
+    # verification
+    assert contexts == [(deadline, Priority.HIGH)]
@@ -0,0 +1,176 @@
+import time
+
+import faker
+
+from sevenbridges import Api, Priority, RateLimiter, SharedRateLimiter
+from sevenbridges.tests.providers import RateLimitProvider
+
+generator = faker.Factory.create()
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_get_rate_limit(api, given, verifier):
+    # preconditions
+    reset = int(time.time()) + 60
+    given.rate_limit.defined(limit=1000, remaining=900, reset=reset)
+
+    # action
+    rate_limit = api.rate_limit.get()
+
+    # verification
+    assert rate_limit.rate.limit == 1000
+    assert rate_limit.rate.remaining == 900
+    assert rate_limit.rate.reset == reset
+    verifier.rate_limit.fetched()
+
+
+def test_rate_limiter_spreads_requests(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    limiter = RateLimiter(burst=1)
+    limiter.update(limit=100, remaining=10, reset=clock.now + 10)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert len(clock.slept) == 4
+    assert all(1.0 <= delay < 1.2 for delay in clock.slept)
+    assert limiter.remaining == 5
+
+
+def test_rate_limiter_waits_for_reset(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    limiter = RateLimiter()
+    limiter.update(limit=100, remaining=0, reset=clock.now + 30)
+
+    assert limiter.acquire() == 30
+    assert limiter.remaining == 99
+
+
+def test_rate_limiter_queues_all_callers_behind_reset(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    limiter = RateLimiter(burst=1)
+    limiter.update(limit=3, remaining=1, reset=clock.now + 30)
+
+    delays = [limiter._reserve()[0] for _ in range(5)]
+
+    assert delays == [0, 30, 30, 30, 30]
+    assert limiter.remaining == 0
+
+    # After the reset the replenished budget is handed out one by one and
+    # callers over it wait for the window reported by the server.
+    clock.now += 30
+    waited = [limiter.acquire() for _ in range(3)]
+    limiter.update(limit=3, remaining=0, reset=clock.now + 30)
+
+    assert waited == [0, 0, 0]
+    assert limiter.remaining == 0
+    assert limiter.delay() == 30
+
+
+def test_high_priority_requests_skip_pacing(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    limiter = RateLimiter(burst=1, reserve=0.1)
+    limiter.update(limit=100, remaining=20, reset=clock.now + 10)
+
+    for _ in range(3):
+        limiter.acquire()
+    high = [limiter.acquire(priority=Priority.HIGH) for _ in range(3)]
+
+    assert high == [0, 0, 0]
+    assert len(clock.slept) == 2
+    assert limiter.remaining == 14
+
+
+def test_normal_requests_leave_reserve_to_high_priority(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    limiter = RateLimiter(reserve=0.1)
+    limiter.update(limit=100, remaining=10, reset=clock.now + 30)
+
+    assert limiter.delay(Priority.HIGH) == 0
+    assert limiter.delay() == 30
+    assert limiter.remaining == 10
+
+
+def test_shared_rate_limiter_paces_all_processes(monkeypatch, tmpdir):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    path = str(tmpdir.join('rate-limit'))
+    first = SharedRateLimiter(path, burst=1)
+    second = SharedRateLimiter(path, burst=1)
+    first.update(limit=100, remaining=10, reset=clock.now + 10)
+
+    delays = [limiter.acquire() for limiter in (first, second, first)]
+
+    assert delays[0] == 0
+    assert all(1.0 <= delay < 1.2 for delay in delays[1:])
+    assert first.remaining == 7
+
+
+def test_api_priority_context(base_url, request_mocker, monkeypatch):
+    # preconditions
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    reset = int(clock.now) + 300
+    request_mocker.get('/rate_limit', json={
+        'rate': {'limit': 100, 'remaining': 5, 'reset': reset}
+    })
+    request_mocker.get('/user', json={'username': generator.user_name()})
+    api = Api(base_url, token=generator.uuid4(),
+              rate_limiter=RateLimiter(reserve=0.1))
+
+    # action
+    with api.priority(Priority.HIGH):
+        api.users.me()
+    api.get('/user', priority=Priority.HIGH)
+    api.users.me()
+
+    # verification
+    assert api.active_priority == Priority.NORMAL
+    assert clock.slept == [300]
+
+
+def test_api_paced_by_rate_limiter(base_url, request_mocker, given,
+                                   verifier):
+    # preconditions
+    reset = int(time.time()) + 300
+    given.rate_limit.defined(limit=1000, remaining=1000, reset=reset)
+    request_mocker.get(
+        '/user', json={'username': generator.user_name()},
+        headers=RateLimitProvider.headers(1000, 400, reset)
+    )
+    limiter = RateLimiter()
+    api = Api(base_url, token=generator.uuid4(), rate_limiter=limiter)
+
+    # action
+    api.users.me()
+
+    # verification
+    verifier.rate_limit.fetched()
+    verifier.user.authenticated_user_fetched()
+    assert limiter.limit == 1000
+    assert limiter.remaining == 400
+    assert limiter.reset == reset
@@ -141,3 +141,22 @@ def test_get_execution_details(api, given, verifier):
 
     # verification
     verifier.task.execution_details_fetched(id=id)
+
+
+def test_count_tasks(api, request_mocker):
+    # preconditions
+    project = '{}/{}'.format(generator.user_name(), generator.slug())
+    request_mocker.get('/tasks', json={
+        'href': api.url + '/tasks', 'items': [{'href': generator.url()}],
+        'links': []
+    }, headers={'x-total-matching-query': '42'})
+
+    # action
+    count = api.tasks.count(project=project, status='FAILED')
+
+    # verification
+    assert count == 42
+    assert request_mocker.last_request.qs == {
+        'project': [project.lower()], 'status': ['failed'], 'limit': ['1'],
+        'fields': ['href']
+    }
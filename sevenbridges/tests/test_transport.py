@@ -0,0 +1,134 @@
+import gc
+import json
+import threading
+
+import faker
+import pytest
+
+from sevenbridges import Api
+from sevenbridges.errors import NotFound
+from sevenbridges.http.transport import (
+    HttpxTransport, InMemoryTransport, SessionPool
+)
+from sevenbridges.tests.providers import RateLimitProvider
+
+generator = faker.Factory.create()
+
+
+def test_in_memory_transport(base_url):
+    # preconditions
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.endswith('/user'):
+            return 200, RateLimitProvider.headers(1000, 999, 0), {
+                'username': 'user'
+            }
+        return 404, {}, {'message': 'Not found'}
+
+    api = Api(base_url, token=generator.uuid4(),
+              transport=InMemoryTransport(handler))
+
+    # action
+    user = api.users.me()
+    with pytest.raises(NotFound):
+        api.projects.get('owner/missing')
+
+    # verification
+    assert user.username == 'user'
+    assert api.remaining == 999
+    assert requests[0].headers['X-SBG-Auth-Token'] == api.token
+    assert api.metrics['GET /user']['count'] == 1
+
+
+def test_httpx_transport(base_url, monkeypatch):
+    # preconditions
+    httpx = pytest.importorskip('httpx')
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    responses = iter([
+        httpx.Response(503),
+        httpx.Response(429, headers={'Retry-After': '0'}),
+        httpx.Response(200, json={'id': 'owner/project', 'name': 'test'}),
+    ])
+    received = []
+
+    def handler(request):
+        received.append(json.loads(request.content))
+        return next(responses)
+
+    transport = HttpxTransport(
+        http2=False, client=httpx.Client(transport=httpx.MockTransport(
+            handler
+        ))
+    )
+    api = Api(base_url, token=generator.uuid4(), transport=transport)
+
+    # action
+    project = api.projects.get('owner/project')
+
+    # verification
+    assert project.name == 'test'
+    assert len(received) == 3
+    assert api.metrics['GET /projects/{id}']['retries'] == 1
+
+
+def test_httpx_transport_stream(base_url):
+    # preconditions
+    httpx = pytest.importorskip('httpx')
+    content = b'x' * 100000
+    transport = HttpxTransport(
+        http2=False, client=httpx.Client(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=content)
+        ))
+    )
+    api = Api(base_url, token=generator.uuid4(), transport=transport)
+
+    # action
+    response = api.get('https://storage.host/file', stream=True,
+                       append_base=False)
+
+    # verification
+    assert b''.join(response.iter_content(4096)) == content
+
+
+def test_session_pool_drops_sessions_of_finished_threads():
+    # preconditions
+    pool = SessionPool({})
+    pool.session
+
+    # action
+    for _ in range(20):
+        threads = [
+            threading.Thread(target=lambda: pool.session) for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    gc.collect()
+
+    # verification
+    assert len(pool) == 1
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_configured_session_settings_apply_to_all_threads(base_url):
+    # preconditions
+    api = Api(base_url, token=generator.uuid4())
+    main_session = api.session
+    sessions = []
+
+    # action
+    api.configure_session(
+        lambda session: session.headers.update({'X-Team': 'pipelines'})
+    )
+    thread = threading.Thread(target=lambda: sessions.append(api.session))
+    thread.start()
+    thread.join()
+
+    # verification
+    assert sessions[0] is not main_session
+    assert main_session.headers['X-Team'] == 'pipelines'
+    assert sessions[0].headers['X-Team'] == 'pipelines'
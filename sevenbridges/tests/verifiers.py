@@ -178,3 +178,12 @@ class TaskVerifier(object):
 
     def execution_details_fetched(self, id):
         self.checker.check_url('/tasks/{id}/execution_details'.format(id=id))
+
+
+class RateLimitVerifier(object):
+    def __init__(self, request_mocker):
+        self.request_mocker = request_mocker
+        self.checker = Assert(self.request_mocker)
+
+    def fetched(self):
+        self.checker.check_url('/rate_limit')
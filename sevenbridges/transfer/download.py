@@ -5,12 +5,15 @@ import math
 import time
 import hashlib
 from sevenbridges.errors import SbgError
+from sevenbridges.http.concurrency import AdaptiveConcurrency
+from sevenbridges.http.deadline import Deadline
 from sevenbridges.transfer.utils import Chunk, PartSize, Progress, \
     TransferState
 
 
 def _download_chunk(file_path, session, url, retry, timeout, start_byte,
-                    end_byte):
+                    end_byte, deadline=None, retry_budget=None,
+                    concurrency=None, latency=None):
     try:
         fp = os.open(file_path, os.O_CREAT | os.O_WRONLY)
     except IOError:
@@ -21,17 +24,46 @@ def _download_chunk(file_path, session, url, retry, timeout, start_byte,
         headers['Range'] = 'bytes=%d-%d' % (int(start_byte), int(end_byte))
 
     for retry in range(retry):
+        if retry_budget is not None:
+            if not retry:
+                retry_budget.deposit()
+            elif not retry_budget.withdraw():
+                os.close(fp)
+                raise SbgError('Retry budget exhausted.')
+        if deadline is not None:
+            try:
+                deadline.check()
+            except SbgError:
+                os.close(fp)
+                raise
+            timeout = deadline.cap(timeout)
         try:
+            started = time.time()
             response = session.get(
                 url, headers=headers, timeout=timeout, stream=True
             )
+            if latency is not None:
+                # Time to first byte, unlike the transfer time it does not
+                # depend on the chunk size.
+                latency.append(time.time() - started)
+            if response.status_code == 429 or response.status_code >= 500:
+                response.close()
+                raise requests.HTTPError(
+                    'Server responded with %s.' % response.status_code,
+                    response=response
+                )
             chunk_size = response.headers.get('Content-Length')
             os.lseek(fp, start_byte, os.SEEK_SET)
             for chunk in response.iter_content(32 * PartSize.KB):
                 os.write(fp, chunk)
             os.close(fp)
         except requests.RequestException:
-            time.sleep(2 ** retry)
+            if concurrency is not None:
+                concurrency.record_failure()
+            backoff = 2 ** retry
+            if deadline is not None:
+                backoff = min(backoff, deadline.remaining())
+            time.sleep(backoff)
             continue
         else:
             return Chunk(start=start_byte, size=float(chunk_size))
@@ -42,10 +74,24 @@ def _download_chunk(file_path, session, url, retry, timeout, start_byte,
         raise error
 
 
+def _download_chunk_limited(concurrency, *args, **kwargs):
+    # Runs in the pool thread holding the concurrency slot taken on submit.
+    latency = []
+    overloaded = False
+    try:
+        return _download_chunk(*args, concurrency=concurrency,
+                               latency=latency, **kwargs)
+    except SbgError:
+        overloaded = True
+        raise
+    finally:
+        concurrency.release(latency[-1] if latency else None, overloaded)
+
+
 class ChunkedFile(object):
     def __init__(self, file_path, session, url, file_size, chunk_size, retry,
                  timeout,
-                 pool):
+                 pool, deadline=None, retry_budget=None, concurrency=None):
         self.url = url
         self.file_path = file_path
         self.session = session
@@ -57,16 +103,29 @@ class ChunkedFile(object):
         self.total_submitted = 0
         self.total = self.total_chunks()
         self.pool = pool
+        self.deadline = deadline
+        self.retry_budget = retry_budget
+        if concurrency is None:
+            concurrency = AdaptiveConcurrency(initial=4, minimum=4, maximum=4)
+        self.concurrency = concurrency
         self.chunks = self.chunk()
 
     def submit(self):
         futures = []
-        while self.submitted < 4 and not self.done():
+        while not self.done():
+            # At least one chunk of the file is always in flight, the rest
+            # take the free slots of the shared concurrency limit.
+            if not self.submitted:
+                self.concurrency.acquire()
+            elif not self.concurrency.try_acquire():
+                break
             chunk = self.chunks.pop(0)
             futures.append(
                 self.pool.submit(
-                    _download_chunk, self.file_path, self.session, self.url,
-                    self.retry, self.timeout, *chunk)
+                    _download_chunk_limited, self.concurrency,
+                    self.file_path, self.session, self.url,
+                    self.retry, self.timeout, *chunk, deadline=self.deadline,
+                    retry_budget=self.retry_budget)
             )
             self.submitted += 1
             self.total_submitted += 1
@@ -84,11 +143,13 @@ class ChunkedFile(object):
     def __iter__(self):
         futures = self.submit()
         while futures:
-            future = futures[0]
-            self.submitted -= 1
-            futures.remove(future)
+            future = futures.pop(0)
+            try:
+                chunk = future.result()
+            finally:
+                self.submitted -= 1
             futures.extend(self.submit())
-            yield future.result()
+            yield chunk
 
     def chunk(self):
         chunks = []
@@ -104,7 +165,7 @@ class ChunkedFile(object):
 # noinspection PyCallingNonCallable
 class Download(threading.Thread):
     def __init__(self, url=None, file_path=None, retry=5, timeout=10,
-                 chunk_size=None, api=None):
+                 chunk_size=None, api=None, deadline=None):
         """
         File downloader.
         :param url: URL of the file.
@@ -113,6 +174,8 @@ class Download(threading.Thread):
         :param timeout: Connection timeout in seconds.
         :param chunk_size: Size of the chunks in bytes.
         :param api: sbApi instance.
+        :param deadline: Time budget of the whole download in seconds,
+            counted from the start of the download.
         """
         threading.Thread.__init__(self)
         if not url:
@@ -128,7 +191,7 @@ class Download(threading.Thread):
                 message='Chunk size is too small! Minimum chunk size is %s'
                         % PartSize.MINIMUM_PART_SIZE
             )
-        self._session = requests.Session()
+        self._session = api.download_session
         self.url = url
         self._file_path = file_path
         self._temp_file = self._file_path + '.' + hashlib.sha1(
@@ -140,6 +203,8 @@ class Download(threading.Thread):
         else:
             self._chunk_size = PartSize.DOWNLOAD_MINIMUM_PART_SIZE
         self._api = api
+        self._deadline = api.active_deadline
+        self._deadline_timeout = deadline
         self._bytes_done = 0
         self._running = threading.Event()
         self._callback = None
@@ -207,6 +272,11 @@ class Download(threading.Thread):
         self._running.set()
         self._status = TransferState.RUNNING
         self._time_started = time.time()
+        deadline = self._deadline
+        if self._deadline_timeout is not None:
+            deadline = Deadline.earliest(
+                deadline, Deadline(self._deadline_timeout)
+            )
 
         chunked_file = ChunkedFile(self._temp_file,
                                    self._session,
@@ -215,7 +285,10 @@ class Download(threading.Thread):
                                    self._chunk_size,
                                    self._retry,
                                    self._timeout,
-                                   self._api.download_pool)
+                                   self._api.download_pool,
+                                   deadline,
+                                   self._api.retry_budget,
+                                   self._api.download_concurrency)
 
         try:
             for chunk in chunked_file:
@@ -246,18 +319,32 @@ class Download(threading.Thread):
             return self._callback(self._status)
 
     def _get_file_size(self):
+        # Requesting a single byte keeps the connection reusable, total size
+        # is reported in the Content-Range header.
         try:
-            response = requests.get(
-                self.url, timeout=self._timeout, stream=True
+            timeout = self._timeout
+            if self._deadline is not None:
+                self._deadline.check()
+                timeout = self._deadline.cap(timeout)
+            response = self._session.get(
+                self.url, headers={'Range': 'bytes=0-0'},
+                timeout=timeout, stream=True
             )
+            content_range = response.headers.get('Content-Range', None)
+            if response.status_code == 206 and content_range:
+                file_size = content_range.rsplit('/', 1)[-1]
+                # Drain the body so the connection is returned to the pool.
+                response.content
+            else:
+                file_size = response.headers.get('Content-Length', None)
+            response.close()
         except requests.RequestException as e:
             if self._errorback:
                 return self._errorback(SbgError(str(e)))
             else:
                 raise SbgError(str(e))
 
-        file_size = response.headers.get('Content-Length', None)
-        if not file_size:
+        if not file_size or file_size == '*':
             raise SbgError('Server did not provide Content-Length Headers!')
 
         if int(file_size) == 0: